@@ -0,0 +1,315 @@
+"""
+Append-only archive of loaded html pages for record and replay.
+
+Pages are stored WARC-style: every page is a separate gzip member with a small header
+(url, timestamp, page type) appended to a segment file. Segments are rotated when they grow
+over max_segment_size. Separate index.jsonl file keeps every record's segment, offset and
+length, so any page can be read back with a single seek without decompressing the whole segment.
+Every record also keeps id of the crawl (archive opening for writing) it belongs to, so one
+directory can hold several crawls and each of them can be replayed separately.
+"""
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+
+import gzip
+import json
+import os
+import threading
+
+
+class PageArchive:
+    """
+    A class to represent compressed, append-only archive of html pages.
+    """
+
+    INDEX_NAME = "index.jsonl"
+    SEGMENT_NAME = "segment-{:05d}.warc.gz"
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_size: int = 100 * 1024 * 1024,
+        read_only: bool = False,
+        crawl: Optional[str] = None,
+    ) -> None:
+        """
+        Opens archive in given directory, creates it if it doesn't exist and loads its index.
+        Read-only archive must already exist and is never modified. Pages are read only from
+        selected crawl, so records of different crawls are never mixed.
+
+        Parameters
+        ----------
+            directory: str
+                Directory where segment and index files are stored.
+            max_segment_size: int
+                Segment size in bytes after which new segment is started. By default set to 100 MB.
+            read_only: bool
+                If True, archive can only be read, for example to replay it. By default set to False.
+            crawl: Optional[str]
+                Crawl id. Read-only archive reads pages of this crawl, by default the latest one.
+                Otherwise pages are written as this crawl, by default as a new crawl with
+                current UTC time id.
+
+        Returns
+        ----------
+            None
+        """
+        self.__directory = directory
+        self.__max_segment_size = max_segment_size
+        self.__read_only = read_only
+        self.__lock = threading.Lock()
+        self.__readers = {}
+        self.__entries = []
+        self.__latest = {}
+        self.__crawl = crawl
+        index_path = os.path.join(directory, self.INDEX_NAME)
+        if read_only:
+            if not os.path.isfile(index_path):
+                raise FileNotFoundError(f"No archive index found at {index_path}")
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.isfile(index_path):
+            with open(index_path, "rb" if read_only else "r+b") as f:
+                complete = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    complete += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Line corrupted by interrupted write, its record is unreachable
+                        continue
+                    self.__entries.append(entry)
+                if not read_only:
+                    # Drop unterminated last line, so next entry starts on its own line
+                    f.truncate(complete)
+
+        self.__segment = max((entry["segment"] for entry in self.__entries), default=0)
+
+        crawls = self.crawls()
+        if read_only and crawl is None:
+            self.__crawl = crawls[-1] if crawls else None
+        elif read_only and crawl not in crawls:
+            raise ValueError(f"Crawl {crawl} not found in archive")
+        elif crawl is None:
+            self.__crawl = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+        for index, entry in enumerate(self.__entries):
+            if entry.get("crawl") == self.__crawl:
+                self.__latest[entry["url"]] = index
+
+    def __add_entry(self, entry: dict) -> None:
+        self.__latest[entry["url"]] = len(self.__entries)
+        self.__entries.append(entry)
+
+    @property
+    def crawl(self) -> Optional[str]:
+        """
+        Getter that returns id of selected crawl, which pages are read from and written as
+        """
+        return self.__crawl
+
+    def crawls(self) -> List[Optional[str]]:
+        """
+        Outputs ids of crawls stored in archive, from oldest to latest. Records archived before
+        crawl ids were kept belong to None crawl.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        ----------
+            crawls: List[Optional[str]]
+                Crawl ids
+        """
+        return list(dict.fromkeys(entry.get("crawl") for entry in self.__entries))
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.__latest
+
+    def segment_path(self, segment: int) -> str:
+        """
+        Takes segment number and outputs its file path.
+
+        Parameters
+        ----------
+            segment: int
+                Segment number
+
+        Returns
+        ----------
+            path: str
+                Segment file path
+        """
+        return os.path.join(self.__directory, self.SEGMENT_NAME.format(segment))
+
+    def write(self, url: str, page_source: str, page_type: str) -> dict:
+        """
+        Takes page url, html page source and page type, appends compressed record to current
+        segment and its entry to index.
+
+        Parameters
+        ----------
+            url: str
+                Page url
+            page_source: str
+                Html page source
+            page_type: str
+                Page type, for example "search", "listing" or "amenities"
+
+        Returns
+        ----------
+            entry: dict
+                Index entry with url, timestamp, page_type, segment, offset, length and crawl values
+        """
+        if self.__read_only:
+            raise ValueError("Archive was opened read-only")
+        timestamp = datetime.now(timezone.utc).isoformat()
+        body = page_source.encode("utf-8")
+        header = (
+            "WARC/1.1\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"WARC-Date: {timestamp}\r\n"
+            f"X-Page-Type: {page_type}\r\n"
+            f"X-Crawl: {self.__crawl}\r\n"
+            "Content-Type: text/html; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        ).encode("utf-8")
+        record = gzip.compress(header + body + b"\r\n\r\n")
+
+        with self.__lock:
+            path = self.segment_path(self.__segment)
+            offset = os.path.getsize(path) if os.path.isfile(path) else 0
+            if offset > 0 and offset + len(record) > self.__max_segment_size:
+                self.__segment += 1
+                path = self.segment_path(self.__segment)
+                offset = 0
+            with open(path, "ab") as f:
+                f.write(record)
+
+            entry = {
+                "url": url,
+                "timestamp": timestamp,
+                "page_type": page_type,
+                "segment": self.__segment,
+                "offset": offset,
+                "length": len(record),
+                "crawl": self.__crawl,
+            }
+            # Index line is written only after its record is on disk
+            with open(os.path.join(self.__directory, self.INDEX_NAME), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self.__add_entry(entry)
+        return entry
+
+    def read_entry(self, entry: dict) -> str:
+        """
+        Takes index entry and outputs archived html page source.
+
+        Parameters
+        ----------
+            entry: dict
+                Index entry returned by write or entries methods
+
+        Returns
+        ----------
+            page_source: str
+                Archived html page source
+        """
+        with self.__lock:
+            reader = self.__readers.get(entry["segment"])
+            if reader is None:
+                reader = open(self.segment_path(entry["segment"]), "rb")
+                self.__readers[entry["segment"]] = reader
+            reader.seek(entry["offset"])
+            record = reader.read(entry["length"])
+
+        data = gzip.decompress(record)
+        header_end = data.index(b"\r\n\r\n") + 4
+        return data[header_end:-4].decode("utf-8")
+
+    def read(self, url: str) -> Optional[str]:
+        """
+        Takes page url and outputs its latest html page source archived in selected crawl.
+
+        Parameters
+        ----------
+            url: str
+                Page url
+
+        Returns
+        ----------
+            page_source: Optional[str]
+                Archived html page source. If url wasn't archived in selected crawl outputs None value.
+        """
+        index = self.__latest.get(url)
+        if index is None:
+            return None
+        return self.read_entry(self.__entries[index])
+
+    def entries(self, page_type: Optional[str] = None, crawl: Optional[str] = None) -> Iterator[dict]:
+        """
+        Iterates through index entries of all crawls in the order pages were archived.
+
+        Parameters
+        ----------
+            page_type: Optional[str]
+                If given, only entries of this page type are returned.
+            crawl: Optional[str]
+                If given, only entries of this crawl are returned.
+
+        Returns
+        ----------
+            entries: Iterator[dict]
+                Index entries
+        """
+        for entry in list(self.__entries):
+            if (page_type is None or entry["page_type"] == page_type) and (
+                crawl is None or entry.get("crawl") == crawl
+            ):
+                yield entry
+
+    def records(
+        self, page_type: Optional[str] = None, crawl: Optional[str] = None
+    ) -> Iterator[Tuple[dict, str]]:
+        """
+        Iterates through archived pages of all crawls in the order they were archived.
+
+        Parameters
+        ----------
+            page_type: Optional[str]
+                If given, only pages of this page type are returned.
+            crawl: Optional[str]
+                If given, only pages of this crawl are returned.
+
+        Returns
+        ----------
+            records: Iterator[Tuple[dict, str]]
+                Index entry and html page source pairs
+        """
+        for entry in self.entries(page_type, crawl):
+            yield entry, self.read_entry(entry)
+
+    def close(self) -> None:
+        """
+        Closes opened segment files.
+
+        Parameters
+        ----------
+            None
+
+        Returns
+        ----------
+            None
+        """
+        with self.__lock:
+            for reader in self.__readers.values():
+                reader.close()
+            self.__readers = {}
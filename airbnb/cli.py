@@ -0,0 +1,289 @@
+import argparse
+import cProfile
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from airbnb.archive import PageArchive
+from airbnb.scraper import RateLimiter, Scraper, WRITERS
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Takes command line arguments list and parses it into namespace object.
+
+    Parameters
+    ----------
+        argv: Optional[List[str]]
+            Command line arguments. By default arguments are taken from sys.argv.
+
+    Returns
+    ----------
+        args: argparse.Namespace
+            Parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="airbnb-scrape",
+        description="Collect Airbnb stays for given cities and write them to a file.",
+    )
+    parser.add_argument("cities", nargs="+", help="City names to scrape")
+    parser.add_argument("-c", "--country", required=True, help="Country name")
+    parser.add_argument(
+        "-n", "--samples", type=int, default=10, help="Samples per city (max 300)"
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default=os.getcwd(), help="Directory for the output file"
+    )
+    parser.add_argument("--name", default="Airbnb", help="Output file name")
+    parser.add_argument(
+        "-f", "--format", choices=sorted(WRITERS), default="csv", help="Output format"
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Write raw page text without converting prices and counts to numbers",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of browsers scraping cities in parallel",
+    )
+    parser.add_argument(
+        "--min-delay",
+        type=float,
+        default=2,
+        help="Minimum seconds every browser waits after its page load",
+    )
+    parser.add_argument(
+        "--max-delay",
+        type=float,
+        default=3,
+        help="Maximum seconds every browser waits after its page load",
+    )
+    parser.add_argument(
+        "--max-requests-per-minute",
+        type=float,
+        default=None,
+        help="Page loads per minute allowed across all workers together",
+    )
+    parser.add_argument(
+        "--cache-dir", default=None, help="Directory to cache loaded page sources in"
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=None,
+        help="Directory of compressed archive where every loaded page is recorded",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Read pages from --archive-dir instead of loading them with the browser",
+    )
+    parser.add_argument(
+        "--replay-crawl",
+        metavar="ID",
+        default=None,
+        help="Crawl id to replay, by default the latest crawl in --archive-dir",
+    )
+    parser.add_argument(
+        "--driver-path", default="chromedriver.exe", help="Chrome driver path"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        default=None,
+        help="Write cProfile stats to PATH and print per-phase time summary (single worker only)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.min_delay < 0 or args.max_delay < args.min_delay:
+        parser.error("delays must satisfy 0 <= --min-delay <= --max-delay")
+    # Checked before scraping, so a long crawl isn't lost on an unwritable output directory
+    if not os.path.isdir(args.output_dir) or not os.access(args.output_dir, os.W_OK):
+        parser.error(f"--output-dir {args.output_dir} is not a writable directory")
+    if args.replay and args.archive_dir is None:
+        parser.error("--replay requires --archive-dir")
+    if args.replay_crawl is not None and not args.replay:
+        parser.error("--replay-crawl requires --replay")
+    if args.max_requests_per_minute is not None and args.max_requests_per_minute <= 0:
+        parser.error("--max-requests-per-minute must be positive")
+    if args.profile and args.workers > 1:
+        # cProfile follows only one thread and Python 3.12+ refuses concurrent profilers
+        parser.error("--profile can only be used with a single worker")
+    return args
+
+
+def scrape_city(
+    args: argparse.Namespace,
+    city: str,
+    archive: Optional[PageArchive] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Optional[Scraper]:
+    """
+    Takes parsed arguments and city name, scrapes city with its own scraper object.
+    Browser is always closed afterwards. If scraping fails, error is reported and city is skipped.
+
+    Parameters
+    ----------
+        args: argparse.Namespace
+            Parsed command line arguments
+        city: str
+            City name
+        archive: Optional[PageArchive]
+            Page archive shared by all workers. By default pages are not archived.
+        rate_limiter: Optional[RateLimiter]
+            Rate limiter shared by all workers. By default page loads are not limited.
+
+    Returns
+    ----------
+        scraper: Optional[Scraper]
+            Scraper object that collected city data or None value if scraping failed
+    """
+    scraper = Scraper(
+        args.driver_path,
+        min_delay=args.min_delay,
+        max_delay=args.max_delay,
+        cache_dir=args.cache_dir,
+        archive=archive,
+        replay=args.replay,
+        rate_limiter=rate_limiter,
+    )
+    try:
+        scraper.collect_city_items(args.samples, city, args.country)
+    except Exception as error:
+        print(f"ERROR! {city} scraping failed: {error!r}")
+        return None
+    finally:
+        scraper.quit()
+    return scraper
+
+
+def format_timings(timings: dict, total: float) -> str:
+    """
+    Takes phase timings dictionary and total elapsed time, outputs human readable summary table.
+
+    Parameters
+    ----------
+        timings: dict
+            Dictionary with seconds spent in every scraping phase
+        total: float
+            Wall clock seconds the whole run took
+
+    Returns
+    ----------
+        summary: str
+            Summary table
+    """
+    width = max(len(phase) for phase in list(timings) + ["phase", "total"]) + 2
+    lines = [f"{'phase':<{width}}{'seconds':>12}{'share':>9}"]
+    for phase, seconds in timings.items():
+        share = seconds / total * 100 if total else 0.0
+        lines.append(f"{phase:<{width}}{seconds:>12.2f}{share:>8.1f}%")
+    lines.append(f"{'total':<{width}}{total:>12.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Console script entry point. Scrapes given cities and writes collected data to a file.
+
+    Parameters
+    ----------
+        argv: Optional[List[str]]
+            Command line arguments. By default arguments are taken from sys.argv.
+
+    Returns
+    ----------
+        None
+    """
+    args = parse_args(argv)
+    if not args.profile:
+        run(args)
+        return
+
+    # Single profiler covers scraping, normalization and writing, all on main thread
+    time_start = time.perf_counter()
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        scraper = run(args)
+    finally:
+        profile.disable()
+    profile.dump_stats(args.profile)
+    print(f"cProfile stats were written to {args.profile}")
+    print(format_timings(scraper.timings, time.perf_counter() - time_start))
+
+
+def run(args: argparse.Namespace) -> Scraper:
+    """
+    Takes parsed arguments, scrapes every city and writes collected data to a file.
+    With a single worker everything runs on the calling thread.
+
+    Parameters
+    ----------
+        args: argparse.Namespace
+            Parsed command line arguments
+
+    Returns
+    ----------
+        scraper: Scraper
+            Scraper object holding data, timings and amenity sources of all cities
+            which were scraped successfully
+    """
+    archive = None
+    if args.archive_dir:
+        try:
+            # Replay only reads archive, so it can't alter or create it
+            archive = PageArchive(args.archive_dir, read_only=args.replay, crawl=args.replay_crawl)
+        except (FileNotFoundError, ValueError) as error:
+            raise SystemExit(f"ERROR! {error}")
+        if args.replay:
+            print(f"Replaying crawl {archive.crawl}")
+        else:
+            print(f"Archiving pages as crawl {archive.crawl}")
+    rate_limiter = None
+    if args.max_requests_per_minute is not None:
+        rate_limiter = RateLimiter(args.max_requests_per_minute)
+
+    def scrape(city: str) -> Optional[Scraper]:
+        return scrape_city(args, city, archive, rate_limiter)
+
+    if args.workers == 1:
+        results = [scrape(city) for city in args.cities]
+    else:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(scrape, args.cities))
+    if archive is not None:
+        archive.close()
+
+    results = [result for result in results if result is not None]
+    if not results:
+        raise SystemExit("ERROR! No city was scraped, nothing was written")
+    if args.replay and not any(result.collected_dic["url"] for result in results):
+        raise SystemExit("ERROR! No stays were found in archive, nothing was written")
+
+    # Merge every worker's data into first scraper, so it writes a single file
+    scraper = results[0]
+    for other in results[1:]:
+        for key, values in other.collected_dic.items():
+            scraper.collected_dic[key].extend(values)
+        for phase, seconds in other.timings.items():
+            scraper.timings[phase] += seconds
+        for source, count in other.amenity_sources.items():
+            scraper.amenity_sources[source] += count
+    scraper.write_dataframe(args.output_dir, args.name, args.format, args.raw)
+    print(
+        "Amenities taken from stay page: {listing}, amenities subpage: {subpage}, "
+        "not found: {missing}".format(**scraper.amenity_sources)
+    )
+    return scraper
+
+
+if __name__ == "__main__":
+    main()
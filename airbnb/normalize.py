@@ -0,0 +1,159 @@
+"""
+Batched normalization of raw scraped text into numeric columns.
+
+Extraction only stores text exactly as it's shown on the page (for example "$1,234 / night",
+"(120 reviews)" or "Shared half-bath"), every column is then converted at once with vectorized
+pandas string operations. Raw data written with write_dataframe(raw=True) can be normalized
+again after parser fixes without loading any pages.
+"""
+import numpy as np
+import pandas as pd
+
+
+# Columns of normalized data in the order they are written
+COLUMNS = [
+    "title",
+    "url",
+    "city",
+    "location",
+    "property_type",
+    "latitude",
+    "longitude",
+    "price",
+    "currency",
+    "rating",
+    "reviews",
+    "guests",
+    "studio",
+    "bedrooms",
+    "beds",
+    "baths",
+    "shared_bath",
+    "kitchen",
+    "wifi",
+    "washer",
+    "tv",
+    "parking",
+    "refrigerator",
+]
+
+# Currency symbols, ISO codes and local abbreviations which can be shown next to price
+CURRENCY_PATTERN = r"([A-Z]{0,2}[$€£¥₩₹₽₺₪฿₫₱₴₦]|\b[A-Z]{3}\b|\bkr\b|zł|Kč|\bFt\b|\blei\b)"
+
+# First number together with its thousands and decimal separators
+NUMBER_PATTERN = r"(\d(?:[\d.,\s\u00a0\u202f]*\d)?)"
+
+
+def to_number(raw: pd.Series) -> pd.Series:
+    """
+    Takes series of raw text and converts first number in every value to float. Both "1,234.5"
+    and "1.234,5" locales are understood: separator before last group is decimal separator when
+    both separators are used or when it's not followed by exactly three digits.
+
+    Parameters
+    ----------
+        raw:pd.Series
+            Raw text series
+
+    Returns
+    ----------
+        numbers:pd.Series
+            Float series, values without number are NaN
+    """
+    number = raw.astype("string").str.extract(NUMBER_PATTERN, expand=False)
+    number = number.str.replace(r"[\s\u00a0\u202f]", "", regex=True)
+
+    last_separator = number.str.extract(r"([.,])\d*$", expand=False)
+    last_group = number.str.extract(r"[.,](\d*)$", expand=False).str.len()
+    both_separators = number.str.contains(",", regex=False) & number.str.contains(".", regex=False)
+    is_decimal = last_separator.notna() & (both_separators | (last_group != 3))
+    is_decimal = is_decimal.fillna(False).astype(bool)
+    decimal_comma = is_decimal & (last_separator == ",").fillna(False).astype(bool)
+
+    cleaned = np.where(
+        decimal_comma,
+        number.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+        np.where(
+            is_decimal,
+            number.str.replace(",", "", regex=False),
+            number.str.replace(r"[.,]", "", regex=True),
+        ),
+    )
+    return pd.to_numeric(pd.Series(cleaned, index=raw.index), errors="coerce")
+
+
+def to_count(raw: pd.Series) -> pd.Series:
+    """
+    Takes series of raw text and converts first number in every value to nullable integer.
+
+    Parameters
+    ----------
+        raw:pd.Series
+            Raw text series
+
+    Returns
+    ----------
+        counts:pd.Series
+            Int64 series, values without number are missing
+    """
+    return to_number(raw).round().astype("Int64")
+
+
+def to_flag(mask: pd.Series, raw: pd.Series) -> pd.Series:
+    """
+    Takes boolean mask and raw text series, outputs 1 or 0 flags which are missing where raw text is missing.
+
+    Parameters
+    ----------
+        mask:pd.Series
+            Boolean series
+        raw:pd.Series
+            Raw text series
+
+    Returns
+    ----------
+        flags:pd.Series
+            Int64 series of 1 and 0 values
+    """
+    return mask.fillna(False).astype("Int64").mask(raw.isna())
+
+
+def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Takes dataframe of raw scraped text and converts price, currency, rating, reviews, guests,
+    bedrooms, studio, beds, baths and shared bath columns into numbers.
+
+    Parameters
+    ----------
+        df:pd.DataFrame
+            Dataframe with raw columns collected by scraper
+
+    Returns
+    ----------
+        df:pd.DataFrame
+            Normalized dataframe with columns ordered as COLUMNS
+    """
+    df = df.copy()
+
+    price = df["price"].astype("string")
+    df["currency"] = price.str.extract(CURRENCY_PATTERN, expand=False)
+    df["price"] = to_number(price)
+    df["rating"] = to_number(df["rating"])
+    df["reviews"] = to_count(df["reviews"])
+    df["guests"] = to_count(df["guests"])
+    df["beds"] = to_count(df["beds"])
+
+    # Bedrooms text without a number is a studio, which counts as one bedroom
+    bedrooms = df["bedrooms"].astype("string")
+    bedrooms_count = to_count(bedrooms)
+    studio = bedrooms.notna() & bedrooms_count.isna()
+    df["studio"] = to_flag(studio, bedrooms)
+    df["bedrooms"] = bedrooms_count.mask(studio.fillna(False).astype(bool), 1)
+
+    baths = df["baths"].astype("string")
+    half_bath = baths.str.contains("half-bath", case=False, regex=False)
+    baths_count = to_number(baths)
+    df["baths"] = baths_count.mask(baths_count.isna() & half_bath.fillna(False).astype(bool), 0.5)
+    df["shared_bath"] = to_flag(baths.str.contains("shared", case=False, regex=False), baths)
+
+    return df[[column for column in COLUMNS if column in df.columns]]
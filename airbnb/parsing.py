@@ -0,0 +1,604 @@
+"""
+Browser-free extraction of Airbnb data from html page sources.
+
+Every function here works on already loaded html, so pages can be parsed (or re-parsed)
+without selenium, chrome or network access.
+"""
+from bs4 import BeautifulSoup
+from typing import List, Optional, Tuple
+
+import json
+
+
+# Columns of collected data. Price, rating, reviews, guests, bedrooms, beds and baths
+# hold raw page text which is converted to numbers by airbnb.normalize module
+COLUMNS = [
+    "title",
+    "url",
+    "city",
+    "location",
+    "property_type",
+    "latitude",
+    "longitude",
+    "price",
+    "rating",
+    "reviews",
+    "guests",
+    "bedrooms",
+    "beds",
+    "baths",
+    "kitchen",
+    "wifi",
+    "washer",
+    "tv",
+    "parking",
+    "refrigerator",
+]
+
+# Amenity columns and text which marks amenity on amenities page
+AMENITIES = {
+    "kitchen": "Kitchen",
+    "refrigerator": "Refrigerator",
+    "wifi": "Wifi",
+    "washer": "Washer",
+    "tv": "TV",
+    "parking": "Free parking on premises",
+}
+
+# Key of full amenities list in json state embedded into stay page
+EMBEDDED_AMENITIES_KEY = "seeAllAmenitiesGroups"
+
+
+def make_soup(page_source: str) -> BeautifulSoup:
+    """
+    Takes html page source and outputs BeautifulSoup object.
+
+    Parameters
+    ----------
+        page_source:str
+            Html page source
+
+    Returns
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+    """
+    return BeautifulSoup(page_source, "html.parser")
+
+
+def find_next_page(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes BeautifulSoup object and tries to find next page in AirBnB search query.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        next_page: Optional[str]
+            If next page was found returns it, if not outputs None value.
+    """
+    try:
+        next_page = f"https://www.airbnb.com{soup.find('a', class_='_za9j7e')['href']}"
+    except (TypeError, KeyError):
+        next_page = None
+    return next_page
+
+
+def parse_search_page(page_source: str) -> Tuple[List[dict], Optional[str]]:
+    """
+    Takes search query html page source, extracts every listed stay and next page url.
+
+    Parameters
+    ----------
+        page_source:str
+            Search query html page source
+
+    Returns
+    ----------
+        items:List[dict]
+            Search card data of every listed stay, see parse_search_item
+        next_page:Optional[str]
+            Next search page url or None value if it's the last page
+    """
+    soup = make_soup(page_source)
+    items = [parse_search_item(item) for item in soup.find_all("div", class_="_fhph4u")]
+    return items, find_next_page(soup)
+
+
+def parse_search_item(soup: BeautifulSoup) -> dict:
+    """
+    Takes beautiful soup object of single search card and extracts all data shown on it.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        item:dict
+            Dictionary with url, title, property_type, location, rating, reviews, price,
+            guests, bedrooms, beds and baths values. Values are raw page text.
+    """
+    return {
+        "url": get_item_url(soup),
+        "title": get_item_title(soup),
+        "property_type": get_item_property_type(soup),
+        "location": get_item_location(soup),
+        "rating": get_item_rating(soup),
+        "reviews": get_item_reviews(soup),
+        "price": get_item_price(soup),
+        "guests": get_item_guests(soup),
+        "bedrooms": get_item_bedrooms(soup),
+        "beds": get_item_beds(soup),
+        "baths": get_item_baths(soup),
+    }
+
+
+def parse_listing_page(page_source: str) -> dict:
+    """
+    Takes stay html page source and extracts its coordinates, embedded amenities and amenities page url.
+
+    Parameters
+    ----------
+        page_source:str
+            Stay html page source
+
+    Returns
+    ----------
+        listing:dict
+            Dictionary with latitude, longitude, amenities and amenities_url values.
+            Amenities text is empty string if stay page doesn't contain it.
+    """
+    soup = make_soup(page_source)
+    latitude, longitude = get_coordinates(soup)
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "amenities": get_embedded_amenities(soup),
+        "amenities_url": get_amenities_url(soup),
+    }
+
+
+def parse_amenities_page(page_source: str) -> str:
+    """
+    Takes amenities html page source and extracts amenities text.
+
+    Parameters
+    ----------
+        page_source:str
+            Amenities html page source
+
+    Returns
+    ----------
+        amenities:str
+            Html parsed amenities text. If it doesn't exist outputs empty string.
+    """
+    soup = make_soup(page_source)
+    try:
+        amenities = soup.find_all(class_="_1cnse2m")[1].get_text()
+    except IndexError:
+        amenities = ""
+    return amenities
+
+
+def parse_amenities(amenities: str) -> dict:
+    """
+    Takes html parsed amenities text and finds which amenities are available.
+
+    Parameters
+    ----------
+        amenities:str
+            Html parsed text string
+
+    Returns
+    ----------
+        available:dict
+            Dictionary with 1 or 0 value for every amenity column. If amenities text is empty
+            all values are None.
+    """
+    if amenities == "":
+        return {column: None for column in AMENITIES}
+    return {column: get_amenity(amenities, name) for column, name in AMENITIES.items()}
+
+
+def get_amenity(amenities: str, name: str) -> int:
+    """
+    Takes html parsed text string and tries to find if amenity is included into amenities or not.
+
+    Parameters
+    ----------
+        amenities:str
+            Html parsed text string
+        name:str
+            Amenity name as it's written on amenities page
+
+    Returns
+    ----------
+        available:int
+            1 if amenity is available, 0 otherwise
+    """
+    if name in amenities and f"Unavailable: {name}" not in amenities:
+        return 1
+    return 0
+
+
+def get_embedded_amenities(soup: BeautifulSoup) -> str:
+    """
+    Takes beautiful soup object of stay page and tries to find full amenities list in json state
+    embedded into page. Found amenities are written the same way as on amenities page, unavailable
+    ones are prefixed with "Unavailable: ".
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        amenities:str
+            Amenities text. If page doesn't contain amenities list outputs empty string.
+    """
+    for script in soup.find_all("script", type="application/json"):
+        try:
+            state = json.loads(script.string or "")
+        except ValueError:
+            continue
+        groups = find_key(state, EMBEDDED_AMENITIES_KEY)
+        if not isinstance(groups, list):
+            continue
+        titles = []
+        for group in groups:
+            amenities = group.get("amenities") if isinstance(group, dict) else None
+            if not isinstance(amenities, list):
+                continue
+            for amenity in amenities:
+                # Skip entries without a title, unexpected data shouldn't stop the crawl
+                if not isinstance(amenity, dict) or not isinstance(amenity.get("title"), str):
+                    continue
+                if amenity.get("available", True):
+                    titles.append(amenity["title"])
+                else:
+                    titles.append(f"Unavailable: {amenity['title']}")
+        if titles:
+            return "\n".join(titles)
+    return ""
+
+
+def find_key(state, key: str):
+    """
+    Takes parsed json object and searches it depth first for given dictionary key.
+
+    Parameters
+    ----------
+        state:
+            Parsed json object
+        key:str
+            Dictionary key
+
+    Returns
+    ----------
+        value:
+            Value of first found key. If key doesn't exist outputs None value.
+    """
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if key in node:
+                return node[key]
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None
+
+
+def get_amenities_url(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object of stay page and tries to find amenities page url.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        url:Optional[str]
+            Amenities page url. If it doesn't exist outputs None value.
+    """
+    try:
+        href = soup.find(class_="b6xigss dir dir-ltr").find("a")["href"]
+    except (AttributeError, TypeError, KeyError):
+        return None
+    return f"https://www.airbnb.com{href}"
+
+
+def get_item_url(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item url.
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        url:Optional[str]
+            Item url page
+    """
+    try:
+        url = f"https://www.airbnb.com{soup.find('a').get('href')}"
+    except AttributeError:
+        url = None
+    return url
+
+
+def get_item_property_type(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item property type.
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        property_type:Optional[str]
+            Item property type
+    """
+    try:
+        property_type = soup.find("div", class_="_b14dlit").get_text()
+        property_type = property_type.split(" ")
+        index = property_type.index("in")
+        property_type = " ".join(property_type[:index])
+    except (AttributeError, ValueError):
+        property_type = None
+    return property_type
+
+
+def get_item_location(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item location.
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        location:Optional[str]
+            Item location
+    """
+    try:
+        location = soup.find("div", class_="_b14dlit").get_text()
+        location = location.split(" ")
+        index = location.index("in")
+        location = " ".join(location[index + 1 :])
+    except (AttributeError, ValueError):
+        location = None
+    return location
+
+
+def get_item_title(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item title.
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        title:Optional[str]
+            Item title
+    """
+    try:
+        title = soup.find("span", class_="_bzh5lkq").get_text()
+    except AttributeError:
+        title = None
+    return title
+
+
+def get_item_rating(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item rating.
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        rating:Optional[str]
+            Item rating
+    """
+    try:
+        rating = soup.find("span", class_="_10fy1f8").get_text()
+    except AttributeError:
+        rating = None
+    return rating
+
+
+def get_item_reviews(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item reviews text.
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        reviews:Optional[str]
+            Item reviews count text, for example "(120 reviews)"
+    """
+    try:
+        reviews = soup.find("span", class_="_a7a5sx").get_text()
+    except AttributeError:
+        reviews = None
+    return reviews
+
+
+def get_item_price(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item price text.
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        price:Optional[str]
+            Item price text with currency, for example "$95 / night"
+    """
+    try:
+        price = soup.find("span", class_="_olc9rf0").get_text()
+    except AttributeError:
+        price = None
+    return price
+
+
+def get_item_info(soup: BeautifulSoup, index: int) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find text of item info line (guests, bedrooms, beds, baths)
+    at given position.
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+        index:int
+            Position of info line: 0 - guests, 1 - bedrooms, 2 - beds, 3 - baths
+
+    Returns
+    ----------
+        info:Optional[str]
+            Item info text
+    """
+    try:
+        info = (
+            soup.find("div", class_="_kqh46o")
+            .find_all("span", class_="_3hmsj")[index]
+            .get_text()
+        )
+    except (AttributeError, IndexError):
+        info = None
+    return info
+
+
+def get_item_guests(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item guests text, for example "4 guests".
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        guests:Optional[str]
+            Item guests text
+    """
+    return get_item_info(soup, 0)
+
+
+def get_item_bedrooms(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item bedrooms text, for example "2 bedrooms" or "Studio".
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        bedrooms:Optional[str]
+            Item bedrooms text
+    """
+    return get_item_info(soup, 1)
+
+
+def get_item_beds(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item beds text, for example "2 beds".
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        beds:Optional[str]
+            Item beds text
+    """
+    return get_item_info(soup, 2)
+
+
+def get_item_baths(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Takes beautiful soup object and tries to find item baths text, for example "1.5 shared baths" or "Half-bath".
+    If it doesn't exist outputs None value.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        baths:Optional[str]
+            Item baths text
+    """
+    return get_item_info(soup, 3)
+
+
+def get_coordinates(soup: BeautifulSoup) -> tuple:
+    """
+    Takes beautiful soup object of stay page and tries to find its coordinates.
+    If it doesn't exist outputs None values.
+
+    Parameters
+    ----------
+        soup:BeautifulSoup
+            Beautiful soup object
+
+    Returns
+    ----------
+        coordinates:tuple
+            Latitude and longitude
+    """
+    try:
+        url = soup.find(
+            "a", {"title": "Open this area in Google Maps (opens a new window)"}
+        )["href"]
+        coordinates = url[url.find("=") + 1 : url.find("&")]
+        latitude, longitude = [float(n) for n in coordinates.split(",")]
+    except (AttributeError, TypeError, KeyError, ValueError):
+        latitude, longitude = None, None
+    return latitude, longitude
@@ -1,79 +1,53 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-
 from bs4 import BeautifulSoup
-from typing import Optional
+from contextlib import contextmanager
+from typing import Optional, Tuple
 
+import hashlib
 import random
+import tempfile
+import threading
 import time
-import re
 
-import pandas as pd
 import os
 
+from airbnb import parsing
+from airbnb.archive import PageArchive
 
-class Scraper:
+# Dataframe writers for every supported output file format
+WRITERS = {
+    "csv": lambda df, path: df.to_csv(path, index=False),
+    "json": lambda df, path: df.to_json(path, orient="records", indent=2),
+}
+
+
+class RateLimiter:
     """
-    A class to represent AirBnB city scrapper.
+    A class to represent page load rate limit shared by several scraper objects.
     """
 
-    def __init__(self, driver_path="chromedriver.exe") -> None:
+    def __init__(self, requests_per_minute: float) -> None:
         """
-        Initialize web driver for the scraper object.
+        Initialize rate limiter.
 
         Parameters
         ----------
-            driver_path: str
-                Google chrome driver path which will be used to open and automate google chrome browser.
+            requests_per_minute: float
+                Maximum number of page loads per minute across every scraper using this limiter.
 
         Returns
         ----------
             None
         """
-        self.__driver_path = driver_path
-        self.chrome_options = webdriver.ChromeOptions()       
-        self.chrome_options.add_argument("--enable-javascript")
-        self.chrome_options.add_argument("--no-sandbox")
-        self.__driver = webdriver.Chrome(self.__driver_path, options=self.chrome_options)
-
-        self.__collected_dic = {
-            "title": [],
-            "url": [],
-            "city": [],
-            "location": [],
-            "property_type": [],
-            "latitude": [],
-            "longitude": [],
-            "price": [],
-            "rating": [],
-            "reviews": [],
-            "guests": [],
-            "studio": [],
-            "bedrooms": [],
-            "beds": [],
-            "baths": [],
-            "shared_bath": [],
-            "kitchen": [],
-            "wifi": [],
-            "washer": [],
-            "tv": [],
-            "parking": [],
-            "refrigerator": [],
-        }
-
-    @property
-    def collected_dic(self) -> dict:
-        """
-        Getter that returns dictionary with collected values
-        """
-        return self.__collected_dic
+        if requests_per_minute <= 0:
+            raise ValueError("Requests per minute must be positive")
+        self.__interval = 60 / requests_per_minute
+        self.__next_time = 0.0
+        self.__lock = threading.Lock()
 
-    def get_status(self) -> bool:
+    def wait(self) -> None:
         """
-        Checks if chrome driver is still working or it was closed.
+        Blocks until next page load is allowed. Every call reserves its own time slot,
+        so concurrent callers are spaced evenly.
 
         Parameters
         ----------
@@ -83,659 +57,533 @@ class Scraper:
         ----------
             None
         """
-        try:
-            self.__driver.service.assert_process_still_running()
-            return True
-        except AttributeError:
-            return False
-
-    def get_page_source(self, url: str, target_class: str, waiting_time=60) -> str:
-        """
-        Takes webpage url, loads it with web chrome driver on given maximum waiting time (by default 60sec)
-        and outputs html page source.
-
-        Parameters
-        ----------
-            url: str
-                Webpage url for web driver to open
-            target_class: str
-                CSS class that web driver will try to find when loading a page.
-            waiting time: float
-                Maximum waiting time that driver will try to load target class. By default set to 60 sec.
-
-        Returns
-        ----------
-            page_source: str
-                Loaded html page source
-        """
-
-        if self.get_status():
-            pass
-        else:
-            self.__driver = webdriver.Chrome(self.__driver_path)
+        with self.__lock:
+            now = time.monotonic()
+            start = max(now, self.__next_time)
+            self.__next_time = start + self.__interval
+        if start > now:
+            time.sleep(start - now)
 
-        try:
-            self.__driver.get(url)
-        except TimeoutException:
-            print(f"URL LOADING TIMEOUT! {url} wasn't loading")
-        self.__driver.execute_script("document.body.style.zoom='10%'")
 
-        # Wait until driver loads page and finds desired class
-        try:
-            element = WebDriverWait(self.__driver, waiting_time).until(
-                EC.presence_of_element_located((By.CLASS_NAME, target_class))
-            )
-        except TimeoutException:
-            print(f"FINDING CLASS TIMEOUT! {url} wasn't loading")
+class Scraper:
+    """
+    A class to represent AirBnB city scrapper.
 
-        time.sleep(random.randint(2, 3))
-        return self.__driver.page_source
+    Chrome is started on first page load, so creating scraper object doesn't open a browser.
+    Data extraction lives in browser-free airbnb.parsing module.
+    """
 
-    def get_city_url(self, city: str, country:str) -> str:
+    def __init__(
+        self,
+        driver_path="chromedriver.exe",
+        min_delay: float = 2,
+        max_delay: float = 3,
+        cache_dir: Optional[str] = None,
+        archive: Optional[PageArchive] = None,
+        replay: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
         """
-        Takes city,country name and inserts into AirBnB search query url
+        Initialize the scraper object. Web driver is started lazily by get_page_source.
 
         Parameters
         ----------
-            city:str
-                City name
-            country:
-                Country name
+            driver_path: str
+                Google chrome driver path which will be used to open and automate google chrome browser.
+            min_delay: float
+                Minimum number of seconds to wait after every page load. By default set to 2 sec.
+            max_delay: float
+                Maximum number of seconds to wait after every page load. By default set to 3 sec.
+            cache_dir: Optional[str]
+                Directory where loaded page sources are cached. Cached pages are returned without
+                opening the browser. By default caching is disabled.
+            archive: Optional[PageArchive]
+                Archive where every loaded page is recorded. By default pages are not archived.
+            replay: bool
+                If True, pages are read from archive instead of loading them with the browser,
+                so past crawl can be extracted again without network access. By default set to False.
+            rate_limiter: Optional[RateLimiter]
+                Rate limiter every browser page load waits for. Share one limiter between scrapers
+                to cap their total request rate. By default only min_delay and max_delay are used.
 
         Returns
         ----------
-            url: str
-                Airbnb search query url
-        """
-        url = f"https://www.airbnb.com/s/{city}--{country}/homes?tab_id=home_tab&refinement_paths%5B%5D=%2Fhomes&flexible_trip_dates%5B%5D=july&flexible_trip_dates%5B%5D=june&flexible_trip_dates%5B%5D=august&date_picker_type=flexible_dates&flexible_trip_lengths%5B%5D=one_week"
-        return url
-
-    def find_next_page(self, soup: BeautifulSoup) -> Optional[str]:
+            None
         """
-        Takes BeautifulSoup object and tries to find next page in AirBnB search query.
+        if min_delay < 0 or max_delay < min_delay:
+            raise ValueError("Delays must satisfy 0 <= min_delay <= max_delay")
+        if replay and archive is None:
+            raise ValueError("Replay needs an archive to read pages from")
+        self.__driver_path = driver_path
+        self.__min_delay = min_delay
+        self.__max_delay = max_delay
+        self.__cache_dir = cache_dir
+        self.__archive = archive
+        self.__replay = replay
+        self.__rate_limiter = rate_limiter
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.__chrome_options = None
+        self.__driver = None
+
+        self.__collected_dic = {column: [] for column in parsing.COLUMNS}
+
+        self.__timings = {
+            "fetch": 0.0,
+            "sleep": 0.0,
+            "parse": 0.0,
+            "normalize": 0.0,
+            "write": 0.0,
+        }
 
-        Parameters
-        ----------
-            soup:str
-                BeautifulSoup object
+        # Where amenities of every stay were taken from
+        self.__amenity_sources = {"listing": 0, "subpage": 0, "missing": 0}
 
-        Returns
-        ----------
-            next_page: Optional[str]
-                If next page was found returns it, if not outputs None value.
+    @property
+    def collected_dic(self) -> dict:
         """
-        try:
-            next_page = (
-                f"https://www.airbnb.com{soup.find('a', class_='_za9j7e')['href']}"
-            )
-        except (TypeError, KeyError):
-            next_page = None
-        return next_page
-
-    def collect_city_items(self, samples: int, city: str, country:str) -> None:
+        Getter that returns dictionary with collected values
         """
-        Takes city,country name and number of samples that needs to be scraped, then tries to find needed data and adds it
-        into collected_dic dictionary.
-
-        Parameters
-        ----------
-            samples:int
-                samples that should be collected. Be aware that AirBnB shows only 300 entries, therefore maximum limit is 300 samples
-            city:str
-                City name
-            country:str
-                Country name
+        return self.__collected_dic
 
-        Returns
-        ----------
-            None
+    @property
+    def timings(self) -> dict:
         """
-        time_start = time.time()
-        url = self.get_city_url(city,country)
-        samples_taken = 0
-        while url != None:
-
-            page_source = self.get_page_source(url, "_1g5ss3l")
-            soup = BeautifulSoup(page_source, "html.parser")           
-            for item in soup.find_all("div", class_="_fhph4u"):                
-                if samples_taken == samples:
-                    self.__driver.quit()
-                    print(
-                        f"{city} scraping is done!{samples_taken} samples was taken.Time elapsed: {time.time()-time_start} seconds."
-                    )
-                    return
-                else:
-                    self.__collected_dic["city"].append(city)
-
-                    item_url = self.get_item_url(item)
-                    self.get_item_title(item)
-                    self.get_item_property_type(item)
-                    self.get_item_location(item)
-                    self.get_item_rating(item)
-                    self.get_item_reviews(item)
-                    self.get_item_price(item)
-                    self.get_item_guests(item)
-                    self.get_item_bedrooms(item)
-                    self.get_item_beds(item)
-                    self.get_item_baths(item)
-
-                    self.collect_amenities(item_url)
-
-                    samples_taken = samples_taken + 1
-            url = self.find_next_page(soup)
-        print(
-            f"{city} scraping is done!{samples_taken} samples was taken.Time elapsed: {time.time()-time_start} seconds."
-        )
-
-    def collect_amenities(self, url: str) -> None:
+        Getter that returns dictionary with seconds spent in every scraping phase
         """
-        Takes airbnb apartment url, gets html page source then from it collects longitude and latitude coordinates
-        and amenities data which appends to collected_dic dictionary.
-
-        Parameters
-        ----------
-            url:str
-                Airbnb apartment url
+        return self.__timings
 
-        Returns
-        ----------
-            None
+    @property
+    def amenity_sources(self) -> dict:
         """
-        page_source = self.get_page_source(url, "gmnoprint")
-        soup = BeautifulSoup(page_source, "html.parser")
-
-        # Get latitude and longitude data
-        self.get_coordinates(soup)
-
-        # Open amenities url and collect additional data
-        try:
-            href_url_amenities = soup.find(class_="b6xigss dir dir-ltr").find("a")[
-                "href"
-            ]
-            url_amenities = f"https://www.airbnb.com{href_url_amenities}"
-
-            amenities_page_source = self.get_page_source(url_amenities, "_vzrbjl")
-            soup = BeautifulSoup(amenities_page_source, "html.parser")
-            amenities = soup.find_all(class_="_1cnse2m")[1].get_text()
-
-        except (AttributeError, TypeError, IndexError):
-            amenities = ""
-
-        if amenities == "":
-            self.__collected_dic["kitchen"].append(None)
-            self.__collected_dic["refrigerator"].append(None)
-            self.__collected_dic["wifi"].append(None)
-            self.__collected_dic["washer"].append(None)
-            self.__collected_dic["tv"].append(None)
-            self.__collected_dic["parking"].append(None)
-        else:
-            self.get_amenity_kitchen(amenities)
-            self.get_amenity_refrigerator(amenities)
-            self.get_amenity_wifi(amenities)
-            self.get_amenity_washer(amenities)
-            self.get_amenity_tv(amenities)
-            self.get_amenity_parking(amenities)
-
-    def collect_all(self, samples: int, cities: list, country:str) -> None:
+        Getter that returns dictionary with count of stays whose amenities were taken from stay page,
+        from amenities subpage or weren't found
         """
-        Takes cities list,country name and number of samples that needs to be scraped, loops through every city,
-        scrapes data and appends to collected_dic dictionary.
-
-        Parameters
-        ----------
-            samples:int
-                Samples that should be collected. Be aware that AirBnB shows only 300 entries, therefore maximum limit is 300 samples
-            city:list
-                List which contains cities names as strings.
-            country:str
-                Country name where city is located          
+        return self.__amenity_sources
 
-        Returns
-        ----------
-            None
+    @property
+    def chrome_options(self):
         """
-
-        time_start = time.time()
-        for city in cities:
-            self.collect_city_items(samples,city,country)
-        print(f"All scraping is done! Time elapsed: {time.time()-time_start} seconds.")
-
-    def get_item_url(self, soup: BeautifulSoup) -> Optional[str]:
+        Getter that returns chrome options used to start web driver. Selenium is imported on first access.
         """
-        Takes beautiful soup object, returns and appends found url to collected_dic dictionary.
-        If it doesn't exist returns and appends None value.
-
-        Parameters
-        ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+        if self.__chrome_options is None:
+            from selenium import webdriver
 
-        Returns
-        ----------
-            url:Optional[str]
-                Item url page
-        """
-        try:
-            url = f"https://www.airbnb.com{soup.find('a').get('href')}"
-        except AttributeError:
-            url = None
-        self.__collected_dic["url"].append(url)
-        return url
+            self.__chrome_options = webdriver.ChromeOptions()
+            self.__chrome_options.add_argument("--enable-javascript")
+            self.__chrome_options.add_argument("--no-sandbox")
+        return self.__chrome_options
 
-    def get_item_property_type(self, soup: BeautifulSoup) -> None:
+    @contextmanager
+    def timed(self, phase: str):
         """
-        Takes beautiful soup object, tries to find and append item property type to collected_dic dictionary.
-        If it doesn't exist appends None value.
+        Context manager which adds time spent inside its block to given phase in timings dictionary.
 
         Parameters
         ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+            phase: str
+                Phase name, one of timings dictionary keys.
 
         Returns
         ----------
             None
         """
+        start = time.perf_counter()
         try:
-            property_type = soup.find("div", class_="_b14dlit").get_text()
-            property_type = property_type.split(" ")
-            index = property_type.index("in")
-            property_type = " ".join(property_type[:index])
-        except (AttributeError, IndexError):
-            property_type = None
-        self.__collected_dic["property_type"].append(property_type)
+            yield
+        finally:
+            self.__timings[phase] += time.perf_counter() - start
 
-    def get_item_location(self, soup: BeautifulSoup) -> None:
+    def start_driver(self) -> None:
         """
-        Takes beautiful soup object, tries to find and append item location to collected_dic dictionary.
-        If it doesn't exist appends None value.
+        Starts chrome web driver with scraper chrome options.
 
         Parameters
-        ----------
-            soup:BeautifulSoup
-                Beautiful soup object
-
-        Returns
         ----------
             None
-        """
-        try:
-            location = soup.find("div", class_="_b14dlit").get_text()
-            location = location.split(" ")
-            index = location.index("in")
-            location = " ".join(location[index + 1 :])
-        except (AttributeError, IndexError):
-            location = None
-        self.__collected_dic["location"].append(location)
-
-    def get_item_title(self, soup: BeautifulSoup) -> None:
-        """
-        Takes beautiful soup object, tries to find and append item title to collected_dic dictionary.
-        If it doesn't exist appends None value.
-
-        Parameters
-        ----------
-            soup:BeautifulSoup
-                Beautiful soup object
 
         Returns
         ----------
             None
         """
-        try:
-            title = soup.find("span", class_="_bzh5lkq").get_text()
-        except AttributeError:
-            title = None
-        self.__collected_dic["title"].append(title)
+        from selenium import webdriver
+
+        self.__driver = webdriver.Chrome(self.__driver_path, options=self.chrome_options)
 
-    def get_item_rating(self, soup: BeautifulSoup) -> None:
+    def quit(self) -> None:
         """
-        Takes beautiful soup object, tries to find and append item rating to collected_dic dictionary.
-        If it doesn't exist appends None value.
+        Closes chrome web driver if it was started. Next page load starts it again.
 
         Parameters
         ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+            None
 
         Returns
         ----------
             None
         """
-        try:
-            rating = soup.find("span", class_="_10fy1f8").get_text()
-        except AttributeError:
-            rating = None
-        self.__collected_dic["rating"].append(rating)
+        if self.__driver is not None:
+            self.__driver.quit()
+            self.__driver = None
 
-    def get_item_reviews(self, soup: BeautifulSoup) -> None:
+    def get_status(self) -> bool:
         """
-        Takes beautiful soup object, tries to find and append item reviews count to collected_dic dictionary.
-        If it doesn't exist appends None value.
+        Checks if chrome driver is still working or it was closed.
 
         Parameters
         ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+            None
 
         Returns
         ----------
             None
         """
+        if self.__driver is None:
+            return False
         try:
-            reviews = soup.find("span", class_="_a7a5sx").get_text()
-            reviews = re.findall("[0-9]+", reviews)[0]
+            self.__driver.service.assert_process_still_running()
+            return True
         except AttributeError:
-            reviews = None
-        self.__collected_dic["reviews"].append(reviews)
+            return False
 
-    def get_item_price(self, soup: BeautifulSoup) -> None:
+    def get_page_source(
+        self, url: str, target_class: str, waiting_time=60, page_type: Optional[str] = None
+    ) -> str:
         """
-        Takes beautiful soup object, tries to find and append item price to collected_dic dictionary.
-        If it doesn't exist appends None value.
+        Takes webpage url, loads it with web chrome driver on given maximum waiting time (by default 60sec)
+        and outputs html page source. In replay mode page source is read from archive instead.
 
         Parameters
         ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+            url: str
+                Webpage url for web driver to open
+            target_class: str
+                CSS class that web driver will try to find when loading a page.
+            waiting time: float
+                Maximum waiting time that driver will try to load target class. By default set to 60 sec.
+            page_type: Optional[str]
+                Page type recorded in archive. By default target class is used.
 
         Returns
         ----------
-            None
+            page_source: str
+                Loaded html page source
         """
-        try:
-            price = soup.find("span", class_="_olc9rf0").get_text()
-            price = re.findall("\d+(?:\.\d+)?", price)[0]
-        except (AttributeError, IndexError):
-            price = None
-        self.__collected_dic["price"].append(price)
+        if self.__replay:
+            with self.timed("fetch"):
+                page_source = self.__archive.read(url)
+            if page_source is None:
+                print(f"NOT ARCHIVED! {url} wasn't found in archive")
+                page_source = ""
+            return page_source
+
+        cache_path = self.get_cache_path(url)
+        if cache_path is not None and os.path.isfile(cache_path):
+            with open(cache_path, encoding="utf-8") as f:
+                page_source = f.read()
+            # Cached page is archived only once, so replay can still find it
+            fetched = False
+        else:
+            page_source, loaded = self.load_page_source(url, target_class, waiting_time)
+            # Pages that timed out may be half loaded, they are not cached
+            if cache_path is not None and loaded:
+                self.write_cache(cache_path, page_source)
+            fetched = True
 
-    def get_item_guests(self, soup: BeautifulSoup) -> None:
+        if self.__archive is not None and (fetched or url not in self.__archive):
+            self.__archive.write(url, page_source, page_type or target_class)
+        return page_source
+
+    def load_page_source(
+        self, url: str, target_class: str, waiting_time=60
+    ) -> Tuple[str, bool]:
         """
-        Takes beautiful soup object, tries to find and append item guests count to collected_dic dictionary.
-        If it doesn't exist appends None value.
+        Takes webpage url, loads it with web chrome driver, waits for target class and
+        random delay, then outputs html page source and whether page loaded without timeouts.
 
         Parameters
         ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+            url: str
+                Webpage url for web driver to open
+            target_class: str
+                CSS class that web driver will try to find when loading a page.
+            waiting time: float
+                Maximum waiting time that driver will try to load target class. By default set to 60 sec.
 
         Returns
         ----------
-            None
+            result: Tuple[str, bool]
+                Loaded html page source and False value if url loading or finding target class timed out
         """
-        try:
-            guests = (
-                soup.find("div", class_="_kqh46o")
-                .find_all("span", class_="_3hmsj")[0]
-                .get_text()
-            )
-            guests = re.findall("[0-9]+", guests)[0]
-        except (AttributeError, IndexError):
-            guests = None
-        self.__collected_dic["guests"].append(guests)
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
 
-    def get_item_bedrooms(self, soup: BeautifulSoup) -> None:
-        """
-        Takes beautiful soup object, tries to find and append item bedroom count, studio type,
-        to collected_dic dictionary.
-        If it doesn't exist appends None value.
+        if self.__rate_limiter is not None:
+            with self.timed("sleep"):
+                self.__rate_limiter.wait()
 
-        Parameters
-        ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+        loaded = True
+        with self.timed("fetch"):
+            if self.get_status():
+                pass
+            else:
+                self.start_driver()
 
-        Returns
-        ----------
-            None
-        """
-        try:
-            bedrooms = (
-                soup.find("div", class_="_kqh46o")
-                .find_all("span", class_="_3hmsj")[1]
-                .get_text()
-            )
             try:
-                bedrooms = re.findall("[0-9]+", bedrooms)[0]
-                studio = 0
-            except IndexError:
-                bedrooms = 1
-                studio = 1
-        except (AttributeError, IndexError):
-            studio = None
-            bedrooms = None
-        self.__collected_dic["studio"].append(studio)
-        self.__collected_dic["bedrooms"].append(bedrooms)
-
-    def get_item_beds(self, soup: BeautifulSoup) -> None:
-        """
-        Takes beautiful soup object, tries to find and append item beds count to collected_dic dictionary.
-        If it doesn't exist appends None value.
+                self.__driver.get(url)
+            except TimeoutException:
+                print(f"URL LOADING TIMEOUT! {url} wasn't loading")
+                loaded = False
+            self.__driver.execute_script("document.body.style.zoom='10%'")
 
-        Parameters
-        ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+            # Wait until driver loads page and finds desired class
+            try:
+                element = WebDriverWait(self.__driver, waiting_time).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, target_class))
+                )
+            except TimeoutException:
+                print(f"FINDING CLASS TIMEOUT! {url} wasn't loading")
+                loaded = False
+            page_source = self.__driver.page_source
 
-        Returns
-        ----------
-            None
-        """
-        try:
-            beds = (
-                soup.find("div", class_="_kqh46o")
-                .find_all("span", class_="_3hmsj")[2]
-                .get_text()
-            )
-            beds = re.findall("[0-9]+", beds)[0]
-        except (AttributeError, IndexError):
-            beds = None
-        self.__collected_dic["beds"].append(beds)
+        with self.timed("sleep"):
+            time.sleep(random.uniform(self.__min_delay, self.__max_delay))
+        return page_source, loaded
 
-    def get_item_baths(self, soup: BeautifulSoup) -> None:
+    def write_cache(self, cache_path: str, page_source: str) -> None:
         """
-        Takes beautiful soup object, tries to find and append item baths count,type
-        to collected_dic dictionary.
-        If it doesn't exist appends None value.
+        Takes cache file path and html page source, writes page source to temporary file in cache
+        directory and moves it into place, so interrupted writes never leave truncated cache files.
 
         Parameters
         ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+            cache_path: str
+                Cached page source file path
+            page_source: str
+                Html page source
 
         Returns
         ----------
             None
         """
-        shared_bath = 0
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(cache_path), suffix=".tmp"
+        )
         try:
-            baths = (
-                soup.find("div", class_="_kqh46o")
-                .find_all("span", class_="_3hmsj")[3]
-                .get_text()
-            )
-            try:
-                baths_number = re.findall("\d+(?:\.\d+)?", baths)[0]
-            except IndexError:
-                if "Half-bath" or "half-bath" in baths:
-                    baths_number = 0.5
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                f.write(page_source)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
 
-            try:
-                if baths.split(" ")[1] == "shared":
-                    shared_bath = 1
-            except:
-                shared_bath = 0
-        except (AttributeError, IndexError):
-            baths_number = None
-            shared_bath = None
-
-        self.__collected_dic["baths"].append(baths_number)
-        self.__collected_dic["shared_bath"].append(shared_bath)
-
-    def get_coordinates(self, soup: BeautifulSoup) -> None:
+    def get_cache_path(self, url: str) -> Optional[str]:
         """
-        Takes beautiful soup object, tries to find and append item coordinates to collected_dic dictionary.
-        If it doesn't exist appends None value.
+        Takes webpage url and returns path of file where its page source is cached.
 
         Parameters
         ----------
-            soup:BeautifulSoup
-                Beautiful soup object
+            url: str
+                Webpage url
 
         Returns
         ----------
-            None
+            cache_path: Optional[str]
+                Cached page source file path. If caching is disabled outputs None value.
         """
-        try:
-            url = soup.find(
-                "a", {"title": "Open this area in Google Maps (opens a new window)"}
-            )["href"]
-            coordinates = url[url.find("=") + 1 : url.find("&")]
-            coordinates = [float(n) for n in coordinates.split(",")]
-        except (AttributeError, TypeError):
-            coordinates = [None, None]
-        self.__collected_dic["latitude"].append(coordinates[0])
-        self.__collected_dic["longitude"].append(coordinates[1])
+        if self.__cache_dir is None:
+            return None
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.__cache_dir, f"{key}.html")
 
-    def get_amenity_kitchen(self, amenities: str) -> None:
+    def get_city_url(self, city: str, country:str) -> str:
         """
-        Takes html parsed text string and tries to find if kitchen is included into amenities or not.
+        Takes city,country name and inserts into AirBnB search query url
 
         Parameters
         ----------
-            amenities:str
-                Html parsed text string
+            city:str
+                City name
+            country:
+                Country name
 
         Returns
         ----------
-            None
+            url: str
+                Airbnb search query url
         """
-        kitchen = 0
-        if "Kitchen" in amenities:
-            if "Unavailable: Kitchen" not in amenities:
-                kitchen = 1
-        self.__collected_dic["kitchen"].append(kitchen)
+        url = f"https://www.airbnb.com/s/{city}--{country}/homes?tab_id=home_tab&refinement_paths%5B%5D=%2Fhomes&flexible_trip_dates%5B%5D=july&flexible_trip_dates%5B%5D=june&flexible_trip_dates%5B%5D=august&date_picker_type=flexible_dates&flexible_trip_lengths%5B%5D=one_week"
+        return url
 
-    def get_amenity_wifi(self, amenities: str) -> None:
+    def find_next_page(self, soup: BeautifulSoup) -> Optional[str]:
         """
-        Takes html parsed text string and tries to find if wifi is included into amenities or not.
+        Takes BeautifulSoup object and tries to find next page in AirBnB search query.
 
         Parameters
         ----------
-            amenities:str
-                Html parsed text string
+            soup:str
+                BeautifulSoup object
 
         Returns
         ----------
-            None
+            next_page: Optional[str]
+                If next page was found returns it, if not outputs None value.
         """
-        wifi = 0
-        if "Wifi" in amenities:
-            if "Unavailable: Wifi" not in amenities:
-                wifi = 1
-        self.__collected_dic["wifi"].append(wifi)
+        return parsing.find_next_page(soup)
 
-    def get_amenity_washer(self, amenities: str) -> None:
+    def collect_city_items(self, samples: int, city: str, country:str) -> None:
         """
-        Takes html parsed text string and tries to find if washer is included into amenities or not.
+        Takes city,country name and number of samples that needs to be scraped, then tries to find needed data and adds it
+        into collected_dic dictionary.
 
         Parameters
         ----------
-            amenities:str
-                Html parsed text string
+            samples:int
+                samples that should be collected. Be aware that AirBnB shows only 300 entries, therefore maximum limit is 300 samples
+            city:str
+                City name
+            country:str
+                Country name
 
         Returns
         ----------
             None
         """
-        washer = 0
-        if "Washer" in amenities:
-            if "Unavailable: Washer" not in amenities:
-                washer = 1
-        self.__collected_dic["washer"].append(washer)
+        time_start = time.time()
+        url = self.get_city_url(city,country)
+        samples_taken = 0
+        while url != None:
 
-    def get_amenity_tv(self, amenities: str) -> None:
-        """
-        Takes html parsed text string and tries to find if TV is included into amenities or not.
+            page_source = self.get_page_source(url, "_1g5ss3l", page_type="search")
+            with self.timed("parse"):
+                items, url = parsing.parse_search_page(page_source)
+            for item in items:
+                if samples_taken == samples:
+                    self.quit()
+                    print(
+                        f"{city} scraping is done!{samples_taken} samples was taken.Time elapsed: {time.time()-time_start} seconds."
+                    )
+                    return
+                else:
+                    self.__collected_dic["city"].append(city)
+                    for key, value in item.items():
+                        self.__collected_dic[key].append(value)
 
-        Parameters
-        ----------
-            amenities:str
-                Html parsed text string
+                    self.collect_amenities(item["url"])
 
-        Returns
-        ----------
-            None
-        """
-        tv = 0
-        if "TV" in amenities:
-            if "Unavailable: TV" not in amenities:
-                tv = 1
-        self.__collected_dic["tv"].append(tv)
+                    samples_taken = samples_taken + 1
+        print(
+            f"{city} scraping is done!{samples_taken} samples was taken.Time elapsed: {time.time()-time_start} seconds."
+        )
 
-    def get_amenity_parking(self, amenities: str) -> None:
+    def collect_amenities(self, url: str) -> None:
         """
-        Takes html parsed text string and tries to find if parking is included into amenities or not.
+        Takes airbnb apartment url, gets html page source then from it collects longitude and latitude coordinates
+        and amenities data which appends to collected_dic dictionary. Amenities are read from the stay page itself,
+        amenities subpage is loaded only if stay page doesn't contain them.
 
         Parameters
         ----------
-            amenities:str
-                Html parsed text string
+            url:str
+                Airbnb apartment url
 
         Returns
         ----------
             None
         """
-        parking = 0
-        if "Free parking on premises" in amenities:
-            if "Unavailable: Free parking on premises" not in amenities:
-                parking = 1
-        self.__collected_dic["parking"].append(parking)
+        page_source = self.get_page_source(url, "gmnoprint", page_type="listing")
+        with self.timed("parse"):
+            listing = parsing.parse_listing_page(page_source)
+        self.__collected_dic["latitude"].append(listing["latitude"])
+        self.__collected_dic["longitude"].append(listing["longitude"])
+
+        amenities = listing["amenities"]
+        source = "listing"
+        if amenities == "" and listing["amenities_url"] is not None:
+            # Fall back to opening amenities url
+            amenities_page_source = self.get_page_source(
+                listing["amenities_url"], "_vzrbjl", page_type="amenities"
+            )
+            with self.timed("parse"):
+                amenities = parsing.parse_amenities_page(amenities_page_source)
+            source = "subpage"
+        if amenities == "":
+            source = "missing"
+        self.__amenity_sources[source] += 1
+
+        for key, value in parsing.parse_amenities(amenities).items():
+            self.__collected_dic[key].append(value)
 
-    def get_amenity_refrigerator(self, amenities: str) -> None:
+    def collect_all(self, samples: int, cities: list, country:str) -> None:
         """
-        Takes html parsed text string and tries to find if refrigerator is included into amenities or not.
+        Takes cities list,country name and number of samples that needs to be scraped, loops through every city,
+        scrapes data and appends to collected_dic dictionary.
 
         Parameters
         ----------
-            amenities:str
-                Html parsed text string
+            samples:int
+                Samples that should be collected. Be aware that AirBnB shows only 300 entries, therefore maximum limit is 300 samples
+            city:list
+                List which contains cities names as strings.
+            country:str
+                Country name where city is located
 
         Returns
         ----------
             None
         """
-        refrigerator = 0
-        if "Refrigerator" in amenities:
-            if "Unavailable: Refrigerator" not in amenities:
-                refrigerator = 1
-        self.__collected_dic["refrigerator"].append(refrigerator)
 
-    def write_dataframe(self, path=os.getcwd(), name="Airbnb.csv") -> None:
+        time_start = time.time()
+        for city in cities:
+            self.collect_city_items(samples,city,country)
+        print(f"All scraping is done! Time elapsed: {time.time()-time_start} seconds.")
+
+    def write_dataframe(
+        self, path=os.getcwd(), name="Airbnb.csv", file_format="csv", raw=False
+    ) -> None:
         """
-        Takes path and file name, writes collected dictionary as dataframe to .csv file.
+        Takes path and file name, normalizes collected dictionary and writes it as dataframe to .csv or .json file.
+        Pandas is imported only here.
 
         Parameters
         ----------
             path:str
                 Path where dataframe will be stored.By default it's set to working directory.
             name:str
-                File name which ends with .csv.By default it's set to Airbnb.csv
+                File name which ends with file format extension.By default it's set to Airbnb.csv
+            file_format:str
+                Output file format, either "csv" or "json". By default it's set to csv
+            raw:bool
+                If True, raw page text is written without normalization, so it can be normalized
+                again later with airbnb.normalize.normalize_dataframe. By default set to False.
 
         Returns
         ----------
             None
         """
-        try:
-            df = pd.DataFrame(self.__collected_dic)
-        except ValueError:
-            print("ERROR! - Dictionary values are not the same length")
-            return
-
-        if not isinstance(name, str):
-            raise TypeError
-        if ".csv" != name[-4:]:
-            name = f"{name}.csv"
-        df.to_csv(os.path.join(path, name), index=False)
+        if file_format not in WRITERS:
+            raise ValueError(f"Unsupported file format: {file_format}")
+
+        # Imports are kept out of timed phases, so normalize measures only column conversion
+        import pandas as pd
+        from airbnb.normalize import normalize_dataframe
+
+        with self.timed("normalize"):
+            try:
+                df = pd.DataFrame(self.__collected_dic)
+            except ValueError:
+                print("ERROR! - Dictionary values are not the same length")
+                return
+
+            if not raw:
+                df = normalize_dataframe(df)
+
+        with self.timed("write"):
+            if not isinstance(name, str):
+                raise TypeError
+            if f".{file_format}" != name[-len(file_format) - 1 :]:
+                name = f"{name}.{file_format}"
+            WRITERS[file_format](df, os.path.join(path, name))
         print(f"{name} file was succesfully written in {path}")
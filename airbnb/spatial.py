@@ -0,0 +1,297 @@
+"""
+Spatial grid index over scraped stay coordinates.
+
+Coordinates are converted to points on a sphere and bucketed into a uniform 3D grid of
+cell_size meters. Cells are kept as sorted integer keys, so finding points of any cell is a
+single binary search and all work is done with vectorized NumPy operations. Straight line
+(chord) distance between points on a sphere grows together with great circle distance, so
+radius queries on the grid are exact.
+"""
+from typing import Tuple
+
+import numpy as np
+
+EARTH_RADIUS = 6371008.8
+
+# Bits used for every cell axis in combined cell key. Smallest cell leaves half of key range
+# as headroom, so cells of points and their neighbours never overflow into next axis bits.
+KEY_BITS = 21
+KEY_OFFSET = 1 << (KEY_BITS - 1)
+MIN_CELL_SIZE = 4 * EARTH_RADIUS / (1 << KEY_BITS)
+
+
+def to_xyz(latitudes, longitudes) -> np.ndarray:
+    """
+    Takes latitudes and longitudes in degrees and converts them to points on Earth sphere.
+
+    Parameters
+    ----------
+        latitudes:array-like
+            Latitudes in degrees
+        longitudes:array-like
+            Longitudes in degrees
+
+    Returns
+    ----------
+        points:np.ndarray
+            Array of shape (n, 3) with x, y, z coordinates in meters
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    cos_lat = np.cos(lat)
+    return EARTH_RADIUS * np.stack(
+        [cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1
+    )
+
+
+def to_chord(distance: float) -> float:
+    """
+    Takes great circle distance in meters and converts it to chord length.
+
+    Parameters
+    ----------
+        distance:float
+            Great circle distance in meters
+
+    Returns
+    ----------
+        chord:float
+            Straight line distance through the sphere in meters
+    """
+    return 2 * EARTH_RADIUS * np.sin(min(distance, np.pi * EARTH_RADIUS) / (2 * EARTH_RADIUS))
+
+
+def to_distance(chord):
+    """
+    Takes chord lengths in meters and converts them to great circle distances.
+
+    Parameters
+    ----------
+        chord:array-like
+            Straight line distances through the sphere in meters
+
+    Returns
+    ----------
+        distance:np.ndarray
+            Great circle distances in meters
+    """
+    return 2 * EARTH_RADIUS * np.arcsin(np.clip(np.asarray(chord) / (2 * EARTH_RADIUS), 0, 1))
+
+
+class SpatialIndex:
+    """
+    A class to represent grid index for radius, nearest neighbour and near-duplicate queries
+    over stay coordinates. Stays without coordinates are left out of the index.
+    """
+
+    def __init__(self, latitudes, longitudes, cell_size: float = 500) -> None:
+        """
+        Builds index over given coordinates.
+
+        Parameters
+        ----------
+            latitudes:array-like
+                Latitudes in degrees, for example collected "latitude" column
+            longitudes:array-like
+                Longitudes in degrees, for example collected "longitude" column
+            cell_size:float
+                Grid cell size in meters. Queries are fastest when it's close to typical query radius.
+                By default set to 500 m.
+
+        Returns
+        ----------
+            None
+        """
+        if cell_size < MIN_CELL_SIZE:
+            raise ValueError(f"Cell size must be at least {MIN_CELL_SIZE:.1f} meters")
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        if latitudes.shape != longitudes.shape:
+            raise ValueError("Latitudes and longitudes must be the same length")
+
+        self.__cell_size = cell_size
+        valid = np.flatnonzero(~(np.isnan(latitudes) | np.isnan(longitudes)))
+        self.__build(to_xyz(latitudes[valid], longitudes[valid]), valid)
+
+    def __build(self, points: np.ndarray, positions: np.ndarray) -> None:
+        keys = self.__cell_keys(self.__cells(points))
+        order = np.argsort(keys, kind="stable")
+
+        # Points sorted by cell key, with original positions of every point
+        self.__keys = keys[order]
+        self.__points = points[order]
+        self.__positions = positions[order]
+        self.__cell_keys_unique, self.__cell_starts, self.__cell_counts = np.unique(
+            self.__keys, return_index=True, return_counts=True
+        )
+
+    @classmethod
+    def from_dataframe(cls, df, cell_size: float = 500) -> "SpatialIndex":
+        """
+        Builds index over "latitude" and "longitude" columns of given dataframe.
+
+        Parameters
+        ----------
+            df:pd.DataFrame
+                Dataframe written by scraper
+            cell_size:float
+                Grid cell size in meters. By default set to 500 m.
+
+        Returns
+        ----------
+            index:SpatialIndex
+                Index whose results are dataframe row positions
+        """
+        return cls(df["latitude"].to_numpy(dtype=float), df["longitude"].to_numpy(dtype=float), cell_size)
+
+    def __len__(self) -> int:
+        return len(self.__positions)
+
+    def __cells(self, points: np.ndarray) -> np.ndarray:
+        return np.floor(points / self.__cell_size).astype(np.int64)
+
+    @staticmethod
+    def __cell_keys(cells: np.ndarray) -> np.ndarray:
+        cells = cells + KEY_OFFSET
+        keys = (cells[..., 0] << (2 * KEY_BITS)) | (cells[..., 1] << KEY_BITS) | cells[..., 2]
+        # Cells outside key range can't hold any point, they get key of no cell
+        inside = ((cells >= 0) & (cells < 1 << KEY_BITS)).all(axis=-1)
+        return np.where(inside, keys, -1)
+
+    def __reach(self, radius: float) -> int:
+        # Number of cells in every direction which can hold points within radius
+        return int(np.ceil(radius / self.__cell_size))
+
+    def __neighbour_offsets(self, reach: int) -> np.ndarray:
+        steps = np.arange(-reach, reach + 1)
+        return np.stack(np.meshgrid(steps, steps, steps, indexing="ij"), axis=-1).reshape(-1, 3)
+
+    def __cell_ranges(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Start and count of points in every given cell, zero count for empty cells
+        found = np.searchsorted(self.__cell_keys_unique, keys)
+        found = np.minimum(found, len(self.__cell_keys_unique) - 1)
+        exists = self.__cell_keys_unique[found] == keys
+        return self.__cell_starts[found], np.where(exists, self.__cell_counts[found], 0)
+
+    def query_radius(self, latitude: float, longitude: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Takes coordinates and radius, finds all stays within radius.
+
+        Parameters
+        ----------
+            latitude:float
+                Latitude in degrees
+            longitude:float
+                Longitude in degrees
+            radius:float
+                Search radius in meters
+
+        Returns
+        ----------
+            result:Tuple[np.ndarray, np.ndarray]
+                Positions of found stays in original coordinates and their distances in meters,
+                both sorted from nearest to farthest
+        """
+        if radius < 0:
+            raise ValueError("Radius must not be negative")
+        point = to_xyz(latitude, longitude)
+        reach = self.__reach(to_chord(radius))
+        if len(self) == 0 or (2 * reach + 1) ** 3 > len(self):
+            # Search area covers more cells than there are points, checking every point is cheaper
+            candidates = np.arange(len(self))
+        else:
+            offsets = self.__neighbour_offsets(reach)
+            starts, counts = self.__cell_ranges(self.__cell_keys(self.__cells(point) + offsets))
+            starts, counts = starts[counts > 0], counts[counts > 0]
+            candidates = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        chords = np.linalg.norm(self.__points[candidates] - point, axis=1)
+        inside = chords <= to_chord(radius)
+        candidates, chords = candidates[inside], chords[inside]
+        order = np.argsort(chords, kind="stable")
+        return self.__positions[candidates[order]], to_distance(chords[order])
+
+    def query_nearest(self, latitude: float, longitude: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Takes coordinates and finds k nearest stays.
+
+        Parameters
+        ----------
+            latitude:float
+                Latitude in degrees
+            longitude:float
+                Longitude in degrees
+            k:int
+                Number of nearest stays to find. By default set to 1.
+
+        Returns
+        ----------
+            result:Tuple[np.ndarray, np.ndarray]
+                Positions of found stays in original coordinates and their distances in meters,
+                both sorted from nearest to farthest
+        """
+        if k < 1:
+            raise ValueError("Number of nearest stays k must be at least 1")
+        k = min(k, len(self))
+        radius = self.__cell_size
+        while True:
+            positions, distances = self.query_radius(latitude, longitude, radius)
+            # Everything is inside once radius reaches half of Earth's circumference
+            if len(positions) >= k or radius >= np.pi * EARTH_RADIUS:
+                return positions[:k], distances[:k]
+            radius *= 2
+
+    def find_duplicates(self, radius: float = 25) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds every pair of stays which are not farther than radius from each other, for example
+        the same building listed several times.
+
+        Parameters
+        ----------
+            radius:float
+                Maximum distance between duplicates in meters. By default set to 25 m.
+
+        Returns
+        ----------
+            result:Tuple[np.ndarray, np.ndarray]
+                Array of shape (m, 2) with positions of every pair in original coordinates
+                (smaller position first) and array of distances between them in meters
+        """
+        if radius < 0:
+            raise ValueError("Radius must not be negative")
+        if len(self) == 0:
+            return np.empty((0, 2), dtype=np.int64), np.empty(0)
+        chord_radius = to_chord(radius)
+
+        # Pairs are searched on a grid with radius sized cells, so every point is compared
+        # only with points of its own and adjacent cells
+        grid = SpatialIndex.__new__(SpatialIndex)
+        grid.__cell_size = max(chord_radius, MIN_CELL_SIZE)
+        grid.__build(self.__points, self.__positions)
+        return grid.__pairs(chord_radius)
+
+    def __pairs(self, chord_radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        offsets = self.__neighbour_offsets(self.__reach(chord_radius))
+        # Every pair of different cells is visited from one side only
+        offsets = offsets[[tuple(offset) >= (0, 0, 0) for offset in offsets]]
+        cells = self.__cells(self.__points)
+
+        firsts, seconds, pair_chords = [], [], []
+        for offset in offsets:
+            starts, counts = self.__cell_ranges(self.__cell_keys(cells + offset))
+            first = np.repeat(np.arange(len(self)), counts)
+            second = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            if not offset.any():
+                keep = second > first
+                first, second = first[keep], second[keep]
+            chords = np.linalg.norm(self.__points[first] - self.__points[second], axis=1)
+            inside = chords <= chord_radius
+            firsts.append(first[inside])
+            seconds.append(second[inside])
+            pair_chords.append(chords[inside])
+
+        first = self.__positions[np.concatenate(firsts)]
+        second = self.__positions[np.concatenate(seconds)]
+        pairs = np.sort(np.stack([first, second], axis=1), axis=1)
+        order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+        return pairs[order], to_distance(np.concatenate(pair_chords)[order])
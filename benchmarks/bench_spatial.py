@@ -0,0 +1,110 @@
+"""
+Benchmark of airbnb.spatial index on synthetic stays spread over several cities.
+
+Run from repository root:
+
+    python benchmarks/bench_spatial.py --listings 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from airbnb.spatial import SpatialIndex
+
+# Latitude and longitude of city centers stays are generated around
+CITIES = [(59.91, 10.75), (48.86, 2.35), (51.51, -0.13), (40.71, -74.01), (35.68, 139.69)]
+
+
+def make_listings(count: int, seed: int = 0) -> tuple:
+    """
+    Takes number of listings and generates normally distributed coordinates around city centers.
+
+    Parameters
+    ----------
+        count:int
+            Number of listings
+        seed:int
+            Random generator seed
+
+    Returns
+    ----------
+        coordinates:tuple
+            Latitudes and longitudes arrays
+    """
+    rng = np.random.default_rng(seed)
+    centers = np.array(CITIES)[rng.integers(len(CITIES), size=count)]
+    latitudes = centers[:, 0] + rng.normal(0, 0.05, count)
+    longitudes = centers[:, 1] + rng.normal(0, 0.08, count)
+    return latitudes, longitudes
+
+
+def measure(function, repeats: int) -> float:
+    """
+    Takes function and number of repeats, outputs median call time in milliseconds.
+
+    Parameters
+    ----------
+        function:callable
+            Function without arguments
+        repeats:int
+            Number of calls
+
+    Returns
+    ----------
+        milliseconds:float
+            Median call time
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--listings", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    latitudes, longitudes = make_listings(args.listings)
+    query_latitudes, query_longitudes = make_listings(args.queries, seed=1)
+    queries = list(zip(query_latitudes, query_longitudes))
+
+    start = time.perf_counter()
+    index = SpatialIndex(latitudes, longitudes, cell_size=500)
+    print(f"listings: {len(index)}")
+    print(f"build: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for name, query in [
+        ("radius 500 m", lambda lat, lon: index.query_radius(lat, lon, 500)),
+        ("radius 2 km", lambda lat, lon: index.query_radius(lat, lon, 2000)),
+        ("nearest 10", lambda lat, lon: index.query_nearest(lat, lon, 10)),
+    ]:
+        remaining = iter(queries * 2)
+        milliseconds = measure(lambda: query(*next(remaining)), args.queries)
+        print(f"{name}: {milliseconds:.3f} ms per query")
+
+    latitude, longitude = queries[0]
+    milliseconds = measure(
+        lambda: np.flatnonzero(
+            np.hypot(latitudes - latitude, (longitudes - longitude) * np.cos(np.radians(latitude)))
+            <= 500 / 111195
+        ),
+        5,
+    )
+    print(f"full scan radius 500 m: {milliseconds:.3f} ms per query")
+
+    start = time.perf_counter()
+    pairs, _ = index.find_duplicates(10)
+    print(f"duplicates within 10 m: {len(pairs)} pairs in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,5 +7,6 @@ setup(
     author="Gintautas Jankus",
     url="https://github.com/GQ21/airbnb-scraper",
     packages=["airbnb"],
-    install_requires=["pandas", "beautifulsoup4", "selenium"],
+    install_requires=["pandas", "numpy", "beautifulsoup4", "selenium"],
+    entry_points={"console_scripts": ["airbnb-scrape=airbnb.cli:main"]},
 )
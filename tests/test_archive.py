@@ -0,0 +1,156 @@
+import gzip
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from airbnb.archive import PageArchive
+from airbnb.scraper import Scraper
+
+
+def test_write_read(tmp_path) -> None:
+    """Check if archived page is read back bit-exact, also after archive is reopened"""
+    archive = PageArchive(str(tmp_path))
+    page_source = "<html><body>Ąžuolas ✓</body></html>"
+    entry = archive.write("https://www.airbnb.com/rooms/1", page_source, "listing")
+    assert entry["page_type"] == "listing"
+    assert archive.read("https://www.airbnb.com/rooms/1") == page_source
+    assert archive.read("https://www.airbnb.com/rooms/2") is None
+    archive.close()
+
+    reopened = PageArchive(str(tmp_path), read_only=True)
+    assert reopened.crawl == archive.crawl
+    assert len(reopened) == 1
+    assert "https://www.airbnb.com/rooms/1" in reopened
+    assert reopened.read("https://www.airbnb.com/rooms/1") == page_source
+    reopened.close()
+
+
+def test_record_format(tmp_path) -> None:
+    """Check if every record is a standalone gzip member with WARC header"""
+    archive = PageArchive(str(tmp_path))
+    entry = archive.write("https://www.airbnb.com/s", "<html></html>", "search")
+    with open(archive.segment_path(entry["segment"]), "rb") as f:
+        f.seek(entry["offset"])
+        record = gzip.decompress(f.read(entry["length"]))
+    assert record.startswith(b"WARC/1.1\r\n")
+    assert b"WARC-Target-URI: https://www.airbnb.com/s\r\n" in record
+    assert b"X-Page-Type: search\r\n" in record
+
+
+def test_segment_rotation(tmp_path) -> None:
+    """Check if new segment is started when current one exceeds maximum size"""
+    archive = PageArchive(str(tmp_path), max_segment_size=200)
+    for i in range(5):
+        archive.write(f"https://www.airbnb.com/rooms/{i}", f"<p>{i}</p>" * 20, "listing")
+    segments = {entry["segment"] for entry in archive.entries()}
+    assert len(segments) > 1
+    assert [page for _, page in archive.records()] == [f"<p>{i}</p>" * 20 for i in range(5)]
+    archive.close()
+
+
+def test_latest_record_and_broken_index(tmp_path) -> None:
+    """Check if latest record of url is read, cut short index line is skipped and next write survives reopening"""
+    archive = PageArchive(str(tmp_path), crawl="first")
+    archive.write("https://www.airbnb.com/rooms/1", "old", "listing")
+    archive.write("https://www.airbnb.com/rooms/1", "new", "listing")
+    archive.close()
+    with open(os.path.join(str(tmp_path), PageArchive.INDEX_NAME), "a") as f:
+        f.write('{"url": "https://www.airbnb.com/rooms/2", "seg')
+
+    reopened = PageArchive(str(tmp_path), crawl="first")
+    assert len(reopened) == 2
+    assert reopened.read("https://www.airbnb.com/rooms/1") == "new"
+    reopened.write("https://www.airbnb.com/rooms/3", "third", "listing")
+    reopened.close()
+
+    reopened = PageArchive(str(tmp_path), read_only=True)
+    assert len(reopened) == 3
+    assert "https://www.airbnb.com/rooms/2" not in reopened
+    assert reopened.read("https://www.airbnb.com/rooms/3") == "third"
+    reopened.close()
+
+
+def test_read_only(tmp_path) -> None:
+    """Check if read-only archive requires existing index and leaves archive files untouched"""
+    with pytest.raises(FileNotFoundError):
+        PageArchive(str(tmp_path / "missing"), read_only=True)
+    assert not os.path.exists(tmp_path / "missing")
+
+    archive = PageArchive(str(tmp_path))
+    archive.write("https://www.airbnb.com/rooms/1", "first", "listing")
+    archive.close()
+    index_path = os.path.join(str(tmp_path), PageArchive.INDEX_NAME)
+    with open(index_path, "a") as f:
+        f.write('{"url": "https://www.airbnb.com/rooms/2", "seg')
+    with open(index_path, "rb") as f:
+        index = f.read()
+
+    reopened = PageArchive(str(tmp_path), read_only=True)
+    assert reopened.read("https://www.airbnb.com/rooms/1") == "first"
+    with pytest.raises(ValueError):
+        reopened.write("https://www.airbnb.com/rooms/3", "third", "listing")
+    reopened.close()
+    with open(index_path, "rb") as f:
+        assert f.read() == index
+
+
+def test_crawls(tmp_path) -> None:
+    """Check if pages are read from a single selected crawl, by default the latest one"""
+    for crawl, page_source in [("old", "<p>old</p>"), ("new", "<p>new</p>")]:
+        archive = PageArchive(str(tmp_path), crawl=crawl)
+        assert "https://www.airbnb.com/rooms/1" not in archive
+        archive.write("https://www.airbnb.com/rooms/1", page_source, "listing")
+        archive.close()
+    archive = PageArchive(str(tmp_path), crawl="new")
+    archive.write("https://www.airbnb.com/rooms/2", "<p>second</p>", "listing")
+    archive.close()
+
+    latest = PageArchive(str(tmp_path), read_only=True)
+    assert latest.crawls() == ["old", "new"]
+    assert latest.read("https://www.airbnb.com/rooms/1") == "<p>new</p>"
+    assert latest.read("https://www.airbnb.com/rooms/2") == "<p>second</p>"
+    old = PageArchive(str(tmp_path), read_only=True, crawl="old")
+    assert old.read("https://www.airbnb.com/rooms/1") == "<p>old</p>"
+    assert old.read("https://www.airbnb.com/rooms/2") is None
+    assert len(list(old.entries(crawl="old"))) == 1
+    with pytest.raises(ValueError):
+        PageArchive(str(tmp_path), read_only=True, crawl="missing")
+
+
+def test_replay(tmp_path) -> None:
+    """Check if scraper in replay mode collects city data from archive without a browser"""
+    archive = PageArchive(str(tmp_path))
+    scraper = Scraper(archive=archive, replay=True)
+    city_url = scraper.get_city_url("Oslo", "Norway")
+    archive.write(
+        city_url,
+        """
+        <div class="_fhph4u"><a href="/rooms/1"></a>
+        <span class="_bzh5lkq">Cozy flat</span></div>
+        """,
+        "search",
+    )
+    archive.write(
+        "https://www.airbnb.com/rooms/1",
+        """
+        <a title="Open this area in Google Maps (opens a new window)"
+           href="https://maps.google.com/maps?ll=59.91,10.75&z=14"></a>
+        <div class="b6xigss dir dir-ltr"><a href="/rooms/1/amenities"></a></div>
+        """,
+        "listing",
+    )
+    archive.write(
+        "https://www.airbnb.com/rooms/1/amenities",
+        '<div class="_1cnse2m"></div><div class="_1cnse2m">Wifi Kitchen</div>',
+        "amenities",
+    )
+
+    scraper.collect_city_items(1, "Oslo", "Norway")
+    assert scraper.collected_dic["title"] == ["Cozy flat"]
+    assert scraper.collected_dic["latitude"] == [59.91]
+    assert scraper.collected_dic["wifi"] == [1]
+    assert scraper.amenity_sources == {"listing": 0, "subpage": 1, "missing": 0}
+    assert scraper.get_status() == False
+    archive.close()
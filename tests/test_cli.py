@@ -0,0 +1,142 @@
+import os
+import pstats
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from airbnb.archive import PageArchive
+from airbnb.cli import main, parse_args, format_timings
+from airbnb.scraper import Scraper
+
+
+def test_parse_args() -> None:
+    """Check if parse_args method reads cities, country and concurrency options"""
+    args = parse_args(["Oslo", "Bergen", "-c", "Norway", "-w", "2", "--min-delay", "0"])
+    assert args.cities == ["Oslo", "Bergen"]
+    assert args.country == "Norway"
+    assert args.workers == 2
+    assert args.min_delay == 0
+    assert args.format == "csv"
+    assert args.profile is None
+
+
+def test_parse_args_invalid_delay() -> None:
+    """Check if parse_args method rejects minimum delay bigger than maximum delay"""
+    with pytest.raises(SystemExit):
+        parse_args(["Oslo", "-c", "Norway", "--min-delay", "5", "--max-delay", "1"])
+
+
+
+def test_parse_args_missing_output_dir(tmp_path) -> None:
+    """Check if parse_args method rejects output directory which doesn't exist before scraping starts"""
+    with pytest.raises(SystemExit):
+        parse_args(["Oslo", "-c", "Norway", "-o", str(tmp_path / "missing")])
+
+
+def test_format_timings() -> None:
+    """Check if format_timings method outputs every phase and total"""
+    summary = format_timings({"fetch": 3.0, "normalize": 1.0}, 4.0)
+    assert "fetch" in summary and "75.0%" in summary
+    assert summary.splitlines()[-1].startswith("total")
+    # Every row is aligned, also for phase names longer than "phase"
+    assert len({len(line) for line in summary.splitlines()[:-1]}) == 1
+
+
+def test_parse_args_profile_workers() -> None:
+    """Check if parse_args method rejects profiling with several workers"""
+    with pytest.raises(SystemExit):
+        parse_args(["Oslo", "-c", "Norway", "--profile", "out.prof", "-w", "2"])
+
+
+def test_main_profile_replay(tmp_path) -> None:
+    """Check if main method profiles scraping, normalization and writing of replayed city"""
+    archive = PageArchive(str(tmp_path / "archive"))
+    archive.write(
+        Scraper().get_city_url("Oslo", "Norway"),
+        '<div class="_fhph4u"><a href="/rooms/1"></a><span class="_olc9rf0">$95</span></div>',
+        "search",
+    )
+    archive.close()
+
+    profile_path = str(tmp_path / "run.prof")
+    main(
+        [
+            "Oslo", "-c", "Norway", "-n", "1", "--replay",
+            "--archive-dir", str(tmp_path / "archive"),
+            "-o", str(tmp_path), "--profile", profile_path,
+        ]
+    )
+    assert os.path.isfile(tmp_path / "Airbnb.csv")
+    functions = {function for _, _, function in pstats.Stats(profile_path).stats}
+    assert "normalize_dataframe" in functions
+    assert "collect_city_items" in functions
+
+
+def test_main_city_failure(tmp_path, monkeypatch) -> None:
+    """Check if main method writes cities that succeeded when another city fails"""
+    collect_city_items = Scraper.collect_city_items
+
+    def collect_or_fail(self, samples, city, country):
+        if city == "Bergen":
+            raise RuntimeError("page changed")
+        collect_city_items(self, samples, city, country)
+
+    monkeypatch.setattr(Scraper, "collect_city_items", collect_or_fail)
+    archive = PageArchive(str(tmp_path / "archive"))
+    archive.write(
+        Scraper().get_city_url("Oslo", "Norway"),
+        '<div class="_fhph4u"><a href="/rooms/1"></a></div>',
+        "search",
+    )
+    archive.close()
+
+    main(
+        [
+            "Bergen", "Oslo", "-c", "Norway", "-n", "1", "-w", "2", "--replay",
+            "--archive-dir", str(tmp_path / "archive"), "-o", str(tmp_path),
+        ]
+    )
+    with open(tmp_path / "Airbnb.csv") as f:
+        rows = f.read().splitlines()
+    assert len(rows) == 2 and ",Oslo," in rows[1]
+
+
+def test_main_replay_missing_archive(tmp_path) -> None:
+    """Check if replay exits with error and writes nothing when archive is missing or has no stays"""
+    argv = ["Oslo", "-c", "Norway", "-n", "1", "--replay", "-o", str(tmp_path)]
+    with pytest.raises(SystemExit) as error:
+        main(argv + ["--archive-dir", str(tmp_path / "typo")])
+    assert error.value.code != 0
+    assert not os.path.exists(tmp_path / "typo")
+
+    archive = PageArchive(str(tmp_path / "archive"))
+    archive.write("https://www.airbnb.com/rooms/1", "<html></html>", "listing")
+    archive.close()
+    with pytest.raises(SystemExit) as error:
+        main(argv + ["--archive-dir", str(tmp_path / "archive")])
+    assert error.value.code != 0
+    assert not os.path.exists(tmp_path / "Airbnb.csv")
+
+
+def test_main_replay_crawl(tmp_path) -> None:
+    """Check if replay extracts only selected crawl from archive holding several crawls"""
+    city_url = Scraper().get_city_url("Oslo", "Norway")
+    for crawl, price in [("old", "$80"), ("new", "$95")]:
+        archive = PageArchive(str(tmp_path / "archive"), crawl=crawl)
+        archive.write(
+            city_url,
+            f'<div class="_fhph4u"><a href="/rooms/1"></a><span class="_olc9rf0">{price}</span></div>',
+            "search",
+        )
+        archive.close()
+
+    argv = ["Oslo", "-c", "Norway", "-n", "1", "--replay", "--archive-dir", str(tmp_path / "archive")]
+    main(argv + ["-o", str(tmp_path), "--replay-crawl", "old"])
+    with open(tmp_path / "Airbnb.csv") as f:
+        rows = f.read().splitlines()
+    assert len(rows) == 2 and "80" in rows[1] and "95" not in rows[1]
+    with pytest.raises(SystemExit):
+        main(argv + ["-o", str(tmp_path), "--replay-crawl", "missing"])
+    with pytest.raises(SystemExit):
+        parse_args(["Oslo", "-c", "Norway", "--replay-crawl", "old"])
@@ -0,0 +1,48 @@
+import os
+import sys
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from airbnb.normalize import normalize_dataframe, to_number
+
+
+def test_to_number_locales() -> None:
+    """Check if to_number method understands thousands and decimal separators of different locales"""
+    raw = pd.Series(
+        ["$1,234 / night", "1.234,50 €", "1 234,5 €", "4,85", "4.85", "₩120,000", "New", None]
+    )
+    numbers = to_number(raw)
+    assert numbers[:6].tolist() == [1234.0, 1234.5, 1234.5, 4.85, 4.85, 120000.0]
+    assert numbers[6:].isna().all()
+
+
+def test_normalize_dataframe() -> None:
+    """Check if normalize_dataframe method converts raw page text columns"""
+    raw = pd.DataFrame(
+        {
+            "title": ["Flat", "Room", "Loft"],
+            "price": ["$95 / night", "1.050 kr", None],
+            "rating": ["4.85", None, "4,5"],
+            "reviews": ["(120 reviews)", "(1,234)", None],
+            "guests": ["4 guests", "1 guest", None],
+            "bedrooms": ["Studio", "2 bedrooms", None],
+            "beds": ["2 beds", "1 bed", None],
+            "baths": ["1.5 shared baths", "Half-bath", "1 private bath"],
+            "kitchen": [1, 0, None],
+        }
+    )
+    df = normalize_dataframe(raw)
+    assert df["price"].tolist()[:2] == [95.0, 1050.0]
+    assert df["currency"].tolist()[:2] == ["$", "kr"]
+    assert df["rating"].tolist()[::2] == [4.85, 4.5]
+    assert df["reviews"].tolist()[:2] == [120, 1234]
+    assert df["studio"].tolist()[:2] == [1, 0]
+    assert df["bedrooms"].tolist()[:2] == [1, 2]
+    assert df["baths"].tolist() == [1.5, 0.5, 1.0]
+    assert df["shared_bath"].tolist() == [1, 0, 0]
+    assert df["guests"].isna()[2] and df["studio"].isna()[2]
+    assert list(df.columns) == [
+        "title", "price", "currency", "rating", "reviews", "guests",
+        "studio", "bedrooms", "beds", "baths", "shared_bath", "kitchen",
+    ]
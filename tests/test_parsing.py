@@ -0,0 +1,135 @@
+import os
+import subprocess
+import sys
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from airbnb import parsing
+
+search_card = """
+            <div class="_fhph4u">
+                <a href="/rooms/123"></a>
+                <div class="_b14dlit">Entire apartment in Grünerløkka</div>
+                <span class="_bzh5lkq">Cozy flat</span>
+                <span class="_10fy1f8">4.85</span>
+                <span class="_a7a5sx">(120 reviews)</span>
+                <span class="_olc9rf0">$95 / night</span>
+                <div class="_kqh46o">
+                    <span class="_3hmsj">4 guests</span>
+                    <span class="_3hmsj">Studio</span>
+                    <span class="_3hmsj">2 beds</span>
+                    <span class="_3hmsj">1.5 shared baths</span>
+                </div>
+            </div>
+            """
+
+
+def test_parse_search_page() -> None:
+    """Check if parse_search_page method extracts search card data and next page url"""
+    html_doc = f"""
+                <html><body>
+                {search_card}
+                <a class="_za9j7e" href="/page2">Next</a>
+                </body></html>
+                """
+    items, next_page = parsing.parse_search_page(html_doc)
+    assert next_page == "https://www.airbnb.com/page2"
+    assert items == [
+        {
+            "url": "https://www.airbnb.com/rooms/123",
+            "title": "Cozy flat",
+            "property_type": "Entire apartment",
+            "location": "Grünerløkka",
+            "rating": "4.85",
+            "reviews": "(120 reviews)",
+            "price": "$95 / night",
+            "guests": "4 guests",
+            "bedrooms": "Studio",
+            "beds": "2 beds",
+            "baths": "1.5 shared baths",
+        }
+    ]
+
+
+def test_parse_search_item_missing() -> None:
+    """Check if parse_search_item method outputs None values for empty card"""
+    item = parsing.parse_search_item(BeautifulSoup("<div></div>", "html.parser"))
+    assert item["url"] is None
+    assert item["property_type"] is None
+    assert item["baths"] is None
+
+
+def test_parse_listing_page() -> None:
+    """Check if parse_listing_page method extracts coordinates and amenities url"""
+    html_doc = """
+                <a title="Open this area in Google Maps (opens a new window)"
+                   href="https://maps.google.com/maps?ll=59.91,10.75&z=14"></a>
+                <div class="b6xigss dir dir-ltr"><a href="/rooms/123/amenities"></a></div>
+                """
+    listing = parsing.parse_listing_page(html_doc)
+    assert listing == {
+        "latitude": 59.91,
+        "longitude": 10.75,
+        "amenities": "",
+        "amenities_url": "https://www.airbnb.com/rooms/123/amenities",
+    }
+
+
+def test_get_embedded_amenities() -> None:
+    """Check if get_embedded_amenities method reads full amenities list from page json state"""
+    html_doc = """
+                <script type="application/json">not json</script>
+                <script type="application/json">
+                {"niobeData": [{"sections": [{"section": {
+                    "previewAmenities": [{"title": "Wifi", "available": true}],
+                    "seeAllAmenitiesGroups": [
+                        {"title": "Kitchen", "amenities": [
+                            {"title": "Kitchen", "available": true},
+                            {"title": "Refrigerator", "available": true}]},
+                        {"title": "Not included", "amenities": [
+                            {"title": "Wifi", "available": false}]}
+                    ]}}]}]}
+                </script>
+                """
+    soup = BeautifulSoup(html_doc, "html.parser")
+    amenities = parsing.get_embedded_amenities(soup)
+    assert amenities == "Kitchen\nRefrigerator\nUnavailable: Wifi"
+    assert parsing.parse_amenities(amenities)["wifi"] == 0
+    assert parsing.get_embedded_amenities(BeautifulSoup("<p></p>", "html.parser")) == ""
+
+
+def test_get_embedded_amenities_malformed() -> None:
+    """Check if get_embedded_amenities method skips malformed amenities instead of raising"""
+    html_doc = """
+                <script type="application/json">
+                {"seeAllAmenitiesGroups": [null, "text", {"amenities": null},
+                    {"amenities": [{"available": true}, 5, {"title": "Washer"}]}]}
+                </script>
+                """
+    soup = BeautifulSoup(html_doc, "html.parser")
+    assert parsing.get_embedded_amenities(soup) == "Washer"
+
+    for state in ['{"seeAllAmenitiesGroups": {"amenities": []}}', '{"seeAllAmenitiesGroups": [null]}']:
+        soup = BeautifulSoup(f'<script type="application/json">{state}</script>', "html.parser")
+        assert parsing.get_embedded_amenities(soup) == ""
+
+
+def test_parse_amenities() -> None:
+    """Check if parse_amenities method marks unavailable amenities"""
+    amenities = parsing.parse_amenities("Wifi Kitchen TV Unavailable: TV")
+    assert amenities["wifi"] == 1
+    assert amenities["kitchen"] == 1
+    assert amenities["tv"] == 0
+    assert amenities["parking"] == 0
+    assert set(parsing.parse_amenities("").values()) == {None}
+
+
+def test_import_is_browser_free() -> None:
+    """Check if importing scraper module doesn't import selenium or pandas"""
+    code = "import sys, airbnb.scraper; print('selenium' in sys.modules, 'pandas' in sys.modules)"
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=root, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "False False"
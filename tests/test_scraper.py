@@ -1,19 +1,36 @@
 import os
+import shutil
 import sys
+import threading
+import time
+import pytest
 from bs4 import BeautifulSoup
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from airbnb.scraper import Scraper
+from airbnb.archive import PageArchive
+from airbnb.scraper import RateLimiter, Scraper
 
+# Creating scraper doesn't start chrome, it's started only by tests that load pages
 scraper = Scraper()
 
+requires_driver = pytest.mark.skipif(
+    shutil.which("chromedriver") is None and not os.path.isfile("chromedriver.exe"),
+    reason="chrome driver is not available",
+)
+
 
 def get_status() -> None:
     """Check if webdriver is working"""
     assert scraper.get_status() == True
 
 
+def test_lazy_driver() -> None:
+    """Check if scraper object doesn't start web driver until first page load"""
+    assert scraper.get_status() == False
+
+
+@requires_driver
 def test_get_page_source() -> None:
     """Check if get_page_source method loads page and gets page source"""
     url = "https://www.airbnb.com/s/Norway/homes?tab_id=home_tab&refinement_paths%5B%5D=%2Fhomes&flexible_trip_dates%5B%5D=june&flexible_trip_dates%5B%5D=july&flexible_trip_dates%5B%5D=august&date_picker_type=flexible_dates&query=Norway&place_id=ChIJv-VNj0VoEkYRK9BkuJ07sKE&flexible_trip_lengths%5B%5D=one_week&disable_auto_translation=false&source=structured_search_input_header&search_type=autocomplete_click"
@@ -35,10 +52,79 @@ def test_find_next_page() -> None:
     assert next_page == "https://www.airbnb.com/test"
 
 
+def test_collect_amenities_from_listing(tmp_path) -> None:
+    """Check if collect_amenities method reads amenities from stay page without loading amenities subpage"""
+    archive = PageArchive(str(tmp_path))
+    replay_scraper = Scraper(archive=archive, replay=True)
+    archive.write(
+        "https://www.airbnb.com/rooms/1",
+        """
+        <div class="b6xigss dir dir-ltr"><a href="/rooms/1/amenities"></a></div>
+        <script type="application/json">
+        {"seeAllAmenitiesGroups": [{"amenities": [{"title": "TV", "available": true}]}]}
+        </script>
+        """,
+        "listing",
+    )
+    replay_scraper.collect_amenities("https://www.airbnb.com/rooms/1")
+    assert replay_scraper.collected_dic["tv"] == [1]
+    assert replay_scraper.amenity_sources == {"listing": 1, "subpage": 0, "missing": 0}
+    archive.close()
+
+
 def test_write_dataframe() -> None:
     """Check if write_dataframe method writes .csv file"""
     scraper.write_dataframe()
     assert os.path.isfile("Airbnb.csv") == True
 
 
+def test_rate_limiter() -> None:
+    """Check if rate limiter spaces page loads of several threads evenly"""
+    rate_limiter = RateLimiter(1200)
+    times = []
+    threads = [
+        threading.Thread(target=lambda: (rate_limiter.wait(), times.append(time.monotonic())))
+        for _ in range(4)
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(times) - start >= 3 * 0.05 - 0.01
+
+
+
+def test_cache_skips_timed_out_pages(tmp_path, monkeypatch) -> None:
+    """Check if only fully loaded pages are cached and cache files are written whole"""
+    cache_scraper = Scraper(min_delay=0, max_delay=0, cache_dir=str(tmp_path))
+    monkeypatch.setattr(
+        Scraper, "load_page_source", lambda self, url, target_class, waiting_time=60: ("<p>half</p>", False)
+    )
+    assert cache_scraper.get_page_source("https://www.airbnb.com/a", "x") == "<p>half</p>"
+    assert os.listdir(tmp_path) == []
+
+    monkeypatch.setattr(
+        Scraper, "load_page_source", lambda self, url, target_class, waiting_time=60: ("<p>full</p>", True)
+    )
+    cache_scraper.get_page_source("https://www.airbnb.com/a", "x")
+    assert os.listdir(tmp_path) == [os.path.basename(cache_scraper.get_cache_path("https://www.airbnb.com/a"))]
+    with open(cache_scraper.get_cache_path("https://www.airbnb.com/a")) as f:
+        assert f.read() == "<p>full</p>"
+
+
+
+def test_cache_hits_are_archived_once(tmp_path, monkeypatch) -> None:
+    """Check if pages read from cache are not archived again on every hit"""
+    archive = PageArchive(str(tmp_path / "archive"))
+    cache_scraper = Scraper(min_delay=0, max_delay=0, cache_dir=str(tmp_path), archive=archive)
+    monkeypatch.setattr(
+        Scraper, "load_page_source", lambda self, url, target_class, waiting_time=60: ("<p>full</p>", True)
+    )
+    for _ in range(3):
+        cache_scraper.get_page_source("https://www.airbnb.com/a", "x")
+    assert len(archive) == 1
+    archive.close()
+
+
 scraper.quit()
@@ -0,0 +1,82 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from airbnb.spatial import MIN_CELL_SIZE, SpatialIndex, to_distance, to_xyz
+
+rng = np.random.default_rng(0)
+latitudes = 59.91 + rng.normal(0, 0.02, 2000)
+longitudes = 10.75 + rng.normal(0, 0.04, 2000)
+latitudes[7] = np.nan
+index = SpatialIndex(latitudes, longitudes, cell_size=500)
+
+
+def get_distances(latitude: float, longitude: float) -> np.ndarray:
+    """Great circle distances from given point to every generated stay"""
+    points = to_xyz(latitudes, longitudes)
+    return to_distance(np.linalg.norm(points - to_xyz(latitude, longitude), axis=1))
+
+
+def test_query_radius() -> None:
+    """Check if query_radius method finds the same stays as full scan"""
+    distances = get_distances(59.92, 10.76)
+    for radius in [50, 500, 3000]:
+        positions, found = index.query_radius(59.92, 10.76, radius)
+        assert np.array_equal(np.sort(positions), np.flatnonzero(distances <= radius))
+        assert np.all(np.diff(found) >= 0)
+    assert len(index) == 1999
+
+
+def test_query_nearest() -> None:
+    """Check if query_nearest method finds the same stays as full scan, also far from any stay"""
+    distances = np.nan_to_num(get_distances(59.92, 10.76), nan=np.inf)
+    positions, _ = index.query_nearest(59.92, 10.76, 5)
+    assert np.array_equal(positions, np.argsort(distances)[:5])
+    positions, found = index.query_nearest(0, 0, 1)
+    assert len(positions) == 1 and found[0] > 6000000
+
+
+def test_find_duplicates() -> None:
+    """Check if find_duplicates method finds every pair of stays within radius"""
+    df = pd.DataFrame({"latitude": [59.91, 59.91005, 59.92, None], "longitude": [10.75, 10.75, 10.75, 10.75]})
+    pairs, distances = SpatialIndex.from_dataframe(df).find_duplicates(10)
+    assert pairs.tolist() == [[0, 1]]
+    assert 5 < distances[0] < 6
+
+    pairs, _ = index.find_duplicates(30)
+    points = to_xyz(latitudes, longitudes)
+    all_distances = to_distance(np.linalg.norm(points[:, None] - points[None], axis=2))
+    expected = np.argwhere(np.triu(all_distances <= 30, k=1))
+    assert np.array_equal(pairs, expected)
+
+
+def test_points_on_axes() -> None:
+    """Check if points on coordinate axes and poles get their own cells with smallest cell size"""
+    axis_latitudes = [90, -90, 0, 0, 0, 0]
+    axis_longitudes = [0, 0, 0, 90, 180, -90]
+    for latitude, longitude in zip(axis_latitudes, axis_longitudes):
+        pairs, _ = SpatialIndex([latitude], [longitude]).find_duplicates(5)
+        assert pairs.tolist() == []
+
+    axis_index = SpatialIndex(axis_latitudes, axis_longitudes, cell_size=MIN_CELL_SIZE)
+    assert axis_index.find_duplicates(5)[0].tolist() == []
+    for position, (latitude, longitude) in enumerate(zip(axis_latitudes, axis_longitudes)):
+        positions, _ = axis_index.query_radius(latitude, longitude, 50)
+        assert positions.tolist() == [position]
+
+
+def test_invalid_arguments() -> None:
+    """Check if queries reject negative radius and k smaller than 1"""
+    for query in [
+        lambda: index.query_nearest(59.92, 10.76, 0),
+        lambda: index.query_nearest(59.92, 10.76, -1),
+        lambda: index.query_radius(59.92, 10.76, -1),
+        lambda: index.find_duplicates(-1),
+        lambda: SpatialIndex([59.91], [10.75], cell_size=1),
+    ]:
+        with pytest.raises(ValueError):
+            query()